@@ -4,17 +4,41 @@ AgentCore Runtime Session Management API
 Provides endpoints to manage AgentCore runtime sessions.
 """
 
+import importlib.util
 import logging
 import os
 import urllib.parse
+from typing import Optional
 
-import requests
+import httpx
 from fastapi import APIRouter, HTTPException, Request
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Shared client for AgentCore calls, so repeated stops reuse connections
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared AgentCore HTTP client, creating it on first use."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            timeout=30.0,
+            http2=importlib.util.find_spec("h2") is not None,
+        )
+    return _http_client
+
+
+async def close_http_client():
+    """Close the shared AgentCore HTTP client, if one was created."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 
 def get_agentcore_base_url() -> str:
     """
@@ -104,7 +128,7 @@ async def stop_agentcore_session(request: Request, qualifier: str = "DEFAULT"):
     logger.info(f"Stopping AgentCore session: {session_id}")
 
     try:
-        response = requests.post(url, headers=headers, timeout=30)
+        response = await get_http_client().post(url, headers=headers)
         response.raise_for_status()
 
         logger.info(f"Successfully stopped AgentCore session: {session_id}")
@@ -115,7 +139,7 @@ async def stop_agentcore_session(request: Request, qualifier: str = "DEFAULT"):
         except:
             return {"status": "success", "message": "Session stopped"}
 
-    except requests.exceptions.HTTPError as e:
+    except httpx.HTTPStatusError as e:
         status_code = e.response.status_code
 
         if status_code == 404:
@@ -140,7 +164,7 @@ async def stop_agentcore_session(request: Request, qualifier: str = "DEFAULT"):
                 detail=f"Failed to stop session: {e.response.text}"
             )
 
-    except requests.exceptions.RequestException as e:
+    except httpx.RequestError as e:
         logger.error(f"Request error stopping session {session_id}: {str(e)}")
         raise HTTPException(
             status_code=500,
@@ -6,26 +6,31 @@ based on the path and payload parameters.
 """
 
 import os
-import jwt
-from typing import Any, Optional
+import re
+from functools import lru_cache
+from typing import Any, Callable, Optional
 
-from fastapi import APIRouter, HTTPException, Request
+import jwt
+from fastapi import APIRouter, HTTPException, Request, Response
+from pydantic import BaseModel
 
 from ..models import (
     CreateSessionRequest,
     PermissionResponse,
     SendMessageRequest,
+    SessionStatus,
     SetModelRequest,
     SetPermissionModeRequest,
 )
 from .messages import (
-    get_session_status,
     interrupt_session,
+    read_session_status,
+    retry_after_headers,
     send_message,
     set_model,
     set_permission_mode,
 )
-from .permissions import respond_to_permission
+from .permissions import respond_to_permission, wait_for_permission
 from .files import get_file_info, list_files, save_file, SaveFileRequest
 from .shell import execute_command, get_current_directory, set_current_directory, ShellExecuteRequest
 from .terminal import (
@@ -90,21 +95,364 @@ def parse_session_and_user_from_headers(request: Request) -> tuple[Optional[str]
     auth_header = request.headers.get("authorization", "")
     if auth_header.lower().startswith("bearer "):
         token = auth_header[7:].strip()  # Remove "Bearer " prefix and whitespace
-        try:
-            # Decode JWT without verification (for extracting sub claim)
-            # In production, you should verify the token signature
-            decoded = jwt.decode(token, options={"verify_signature": False})
-            user_id = decoded.get("sub")
-        except jwt.DecodeError:
-            # Token decode failed, user_id remains None
-            pass
-        except Exception:
-            # Any other error, user_id remains None
-            pass
+        user_id = user_id_from_token(token)
 
     return agentcore_session_id, user_id, project_name
 
 
+@lru_cache(maxsize=256)
+def user_id_from_token(token: str) -> Optional[str]:
+    """
+    Extract the user ID (sub claim) from a JWT.
+
+    Clients send the same token on every invocation until it expires, so
+    decoded results are cached per token.
+
+    Args:
+        token: The bearer token
+
+    Returns:
+        The sub claim, or None if the token can't be decoded
+    """
+    try:
+        # Decode JWT without verification (for extracting sub claim)
+        # In production, you should verify the token signature
+        decoded = jwt.decode(token, options={"verify_signature": False})
+        return decoded.get("sub")
+    except jwt.DecodeError:
+        # Token decode failed
+        return None
+    except Exception:
+        # Any other error
+        return None
+
+
+def _cwd_arg(payload, request, http_request):
+    return (payload.get("cwd") if payload else None,)
+
+
+def _timeout_arg(payload, request, http_request):
+    return (payload.get("timeout", 30.0) if payload else 30.0,)
+
+
+def _wait_arg(payload, request, http_request):
+    return (bool(payload.get("wait")) if payload else False,)
+
+
+def _seq_encoding_args(payload, request, http_request):
+    if not payload:
+        return (0, "utf-8")
+    return (payload.get("seq", 0), payload.get("encoding", "utf-8"))
+
+
+def _file_path_arg(payload, request, http_request):
+    return (payload.get("path", "."),)
+
+
+def _required_file_path_arg(payload, request, http_request):
+    file_path = payload.get("path")
+    if not file_path:
+        raise HTTPException(status_code=400, detail="Missing 'path' in payload")
+    return (file_path,)
+
+
+def _required_cwd_arg(payload, request, http_request):
+    cwd = payload.get("cwd")
+    if not cwd:
+        raise HTTPException(status_code=400, detail="Missing 'cwd' in payload")
+    return (cwd,)
+
+
+def _accept_encoding_arg(payload, request, http_request):
+    # Compression also needs the payload's compress opt-in (see execute_command)
+    return (http_request.headers.get("accept-encoding"),)
+
+
+def _http_request_arg(payload, request, http_request):
+    return (http_request,)
+
+
+def _payload_arg(payload, request, http_request):
+    return (payload,)
+
+
+def _invocation_args(payload, request, http_request):
+    return (request, http_request)
+
+
+async def _get_session_status(session_id: str):
+    return read_session_status(session_id)
+
+
+async def _send_message_stream(session_id: str, req: SendMessageRequest):
+    from .messages import send_message_stream
+    return await send_message_stream(session_id, req)
+
+
+async def _backup_project(payload: dict):
+    from .workspace import backup_project, CreateProjectRequest
+    req = CreateProjectRequest.model_validate(payload)
+    return await backup_project(req)
+
+
+async def _create_project(payload: dict):
+    from .workspace import create_project, CreateProjectRequest
+    req = CreateProjectRequest.model_validate(payload)
+    return await create_project(req)
+
+
+async def _list_projects(user_id: str):
+    from .workspace import list_projects
+    return await list_projects(user_id)
+
+
+async def _github_oauth_callback(request: dict, http_request: Request):
+    # GitHub OAuth callback (3LO flow completion)
+    from .oauth import github_oauth_callback
+
+    # Extract session_id from query_params in request payload
+    query_params = request.get("query_params", {})
+    session_id = query_params.get("session_id")
+    if not session_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing session_id query parameter"
+        )
+    return await github_oauth_callback(http_request, session_id)
+
+
+async def _stop_agentcore_session(request: dict, http_request: Request):
+    from .agentcore import stop_agentcore_session
+
+    # Extract qualifier from query_params if provided
+    query_params = request.get("query_params", {})
+    qualifier = query_params.get("qualifier", "DEFAULT")
+    return await stop_agentcore_session(http_request, qualifier)
+
+
+async def _list_github_repositories():
+    from .oauth import list_github_repositories
+    return await list_github_repositories()
+
+
+async def _create_project_from_github(request: dict, http_request: Request):
+    from .oauth import create_project_from_github
+    # Extract params - try both path_params and query_params for compatibility
+    params = request.get("path_params", {}) or request.get("query_params", {})
+    user_id = params.get("user_id")
+    repository_url = params.get("repository_url")
+    project_name = params.get("project_name")
+    branch = params.get("branch")
+
+    if not user_id or not repository_url:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing required parameters: user_id and repository_url"
+        )
+
+    return await create_project_from_github(
+        user_id=user_id,
+        repository_url=repository_url,
+        project_name=project_name,
+        branch=branch
+    )
+
+
+async def _health_check():
+    # Import here to avoid circular dependency
+    from ..server import health_check
+    return await health_check()
+
+
+async def _ping():
+    # Import here to avoid circular dependency
+    from ..server import ping
+    return await ping()
+
+
+# Route table for /invocations: (path template, method) -> (handler, request
+# model built from the payload, required path_params, extractor for any
+# further arguments). Handlers are called with the path params, then the
+# model instance, then the extracted arguments, in that order.
+ROUTES: dict[tuple[str, str], tuple[Callable, Optional[type[BaseModel]], tuple[str, ...], Optional[Callable]]] = {
+    ("/sessions", "POST"): (create_session, CreateSessionRequest, (), None),
+    ("/sessions", "GET"): (list_sessions, None, (), _cwd_arg),
+    ("/sessions/available", "GET"): (list_available_sessions, None, (), _cwd_arg),
+    ("/sessions/{session_id}/status", "GET"): (_get_session_status, None, ("session_id",), None),
+    ("/sessions/{session_id}/messages/stream", "POST"): (_send_message_stream, SendMessageRequest, ("session_id",), None),
+    ("/sessions/{session_id}/messages", "POST"): (send_message, SendMessageRequest, ("session_id",), None),
+    ("/sessions/{session_id}/permissions/respond", "POST"): (respond_to_permission, PermissionResponse, ("session_id",), None),
+    ("/sessions/{session_id}/permissions/wait", "GET"): (wait_for_permission, None, ("session_id",), _timeout_arg),
+    ("/sessions/{session_id}/model", "POST"): (set_model, SetModelRequest, ("session_id",), None),
+    ("/sessions/{session_id}/interrupt", "POST"): (interrupt_session, None, ("session_id",), None),
+    ("/sessions/{session_id}/permission_mode", "POST"): (set_permission_mode, SetPermissionModeRequest, ("session_id",), None),
+    ("/sessions/{session_id}/server_info", "GET"): (get_server_info, None, ("session_id",), None),
+    ("/sessions/{session_id}/history", "GET"): (get_session_history, None, ("session_id",), _cwd_arg),
+    ("/sessions/{session_id}", "DELETE"): (close_session, None, ("session_id",), _wait_arg),
+    ("/files", "GET"): (list_files, None, (), _file_path_arg),
+    ("/files/info", "GET"): (get_file_info, None, (), _required_file_path_arg),
+    ("/files/save", "POST"): (save_file, SaveFileRequest, (), None),
+    ("/shell/execute", "POST"): (execute_command, ShellExecuteRequest, (), _accept_encoding_arg),
+    ("/shell/cwd", "GET"): (get_current_directory, None, (), None),
+    ("/shell/cwd", "POST"): (set_current_directory, None, (), _required_cwd_arg),
+    ("/terminal/sessions", "POST"): (create_terminal_session, TerminalCreateRequest, (), None),
+    ("/terminal/sessions", "GET"): (list_terminal_sessions, None, (), None),
+    ("/terminal/sessions/{session_id}/stream", "GET"): (stream_session_output, None, ("session_id",), _seq_encoding_args),
+    ("/terminal/sessions/{session_id}/output", "GET"): (get_session_output, None, ("session_id",), _seq_encoding_args),
+    ("/terminal/sessions/{session_id}/input", "POST"): (send_input, InputRequest, ("session_id",), None),
+    ("/terminal/sessions/{session_id}/resize", "POST"): (resize_session, ResizeRequest, ("session_id",), None),
+    ("/terminal/sessions/{session_id}/status", "GET"): (get_terminal_status, None, ("session_id",), None),
+    ("/terminal/sessions/{session_id}", "DELETE"): (close_terminal_session, None, ("session_id",), None),
+    ("/workspace/projects/backup", "POST"): (_backup_project, None, (), _payload_arg),
+    ("/workspace/projects", "POST"): (_create_project, None, (), _payload_arg),
+    ("/workspace/projects/{user_id}", "GET"): (_list_projects, None, ("user_id",), None),
+    ("/oauth/github/token", "POST"): (get_github_oauth_token, None, (), _http_request_arg),
+    ("/oauth/github/callback", "GET"): (_github_oauth_callback, None, (), _invocation_args),
+    ("/agentcore/session/stop", "POST"): (_stop_agentcore_session, None, (), _invocation_args),
+    ("/github/repositories", "GET"): (_list_github_repositories, None, (), None),
+    ("/github/create-project", "POST"): (_create_project_from_github, None, (), _invocation_args),
+    ("/health", "GET"): (_health_check, None, (), None),
+    ("/ping", "GET"): (_ping, None, (), None),
+}
+
+# Concrete paths (e.g. "/sessions/abc123/status") are mapped back onto the
+# templates in ROUTES by replacing the id segment
+_PATH_TEMPLATES = (
+    (re.compile(r"^/sessions/[^/]+"), "/sessions/{session_id}"),
+    (re.compile(r"^/terminal/sessions/[^/]+"), "/terminal/sessions/{session_id}"),
+    (re.compile(r"^/workspace/projects/[^/]+"), "/workspace/projects/{user_id}"),
+)
+
+
+# "{name}" placeholders in an invocation path
+_PATH_PARAM_RE = re.compile(r"\{(\w+)\}")
+
+
+def _route_template(path: str) -> str:
+    for pattern, template in _PATH_TEMPLATES:
+        if pattern.match(path):
+            return pattern.sub(template, path, count=1)
+    return path
+
+
+async def _invoke(
+    http_request: Request,
+    request: dict[str, Any],
+    agentcore_session_id: Optional[str],
+    user_id: Optional[str],
+):
+    """Route a single invocation to its handler and return the raw result."""
+    path = request.get("path")
+    method = request.get("method", "POST").upper()
+    payload = request.get("payload", {})
+    path_params = request.get("path_params", {})
+
+    if not path:
+        raise HTTPException(status_code=400, detail="Missing 'path' parameter")
+
+    # Replace path parameters (for logging)
+    resolved_path = _PATH_PARAM_RE.sub(
+        lambda m: str(path_params.get(m.group(1), m.group(0))), path
+    )
+
+    # Log the invocation with agentcore session ID prominently
+    if agentcore_session_id:
+        print(f"🔀 Invocation → {method} {resolved_path}")
+        print(f"   🆔 AgentCore Session ID: {agentcore_session_id}")
+        if user_id:
+            print(f"   👤 User ID: {user_id}")
+        session_id_from_path = path_params.get("session_id")
+        if session_id_from_path:
+            print(f"   📋 Path Session ID: {session_id_from_path}")
+    else:
+        # Fallback when no agentcore session ID
+        log_parts = [f"🔀 Invocation → {method} {resolved_path}"]
+        if user_id:
+            log_parts.append(f"user_id={user_id}")
+        session_id_from_path = path_params.get("session_id")
+        if session_id_from_path:
+            log_parts.append(f"session_id={session_id_from_path}")
+        print(" | ".join(log_parts))
+
+    # Route to appropriate endpoint based on path and method
+    try:
+        route = ROUTES.get((path, method)) or ROUTES.get((_route_template(path), method))
+        if route is None:
+            error_msg = f"Unknown path or method: {method} {path}"
+            print(f"❌ Invocation Error (404): {error_msg} | path_params={path_params} | payload_keys={list(payload.keys()) if payload else []}")
+            raise HTTPException(
+                status_code=404,
+                detail=error_msg,
+            )
+
+        handler, model, param_names, extra_args = route
+        args = []
+        for name in param_names:
+            value = path_params.get(name)
+            if not value:
+                raise HTTPException(
+                    status_code=400, detail=f"Missing {name} in path_params"
+                )
+            args.append(value)
+        if model is not None:
+            args.append(model.model_validate(payload))
+        if extra_args is not None:
+            args.extend(extra_args(payload, request, http_request))
+        return await handler(*args)
+    except HTTPException as e:
+        # Log HTTPException details
+        if e.status_code == 404:
+            print(f"❌ Invocation HTTPException (404): {e.detail}")
+        elif e.status_code >= 400:
+            print(f"❌ Invocation HTTPException ({e.status_code}): {e.detail}")
+        raise
+    except Exception as e:
+        error_detail = f"Invocation error: {str(e)}"
+        print(f"❌ Invocation Exception (500): {error_detail} | path={path} | method={method}")
+        raise HTTPException(status_code=500, detail=error_detail)
+
+
+async def _invoke_batch(
+    http_request: Request,
+    batch: Any,
+    agentcore_session_id: Optional[str],
+    user_id: Optional[str],
+):
+    """
+    Run a list of invocations in order within one request.
+
+    Each entry takes the same keys as a single invocation. A failing entry
+    does not stop the batch; its error is reported in its own result.
+    Routes that answer with a raw Response (streams, HTML pages) cannot be
+    batched.
+
+    Returns:
+        A list of {"status", "body"} dicts, one per entry
+    """
+    if not isinstance(batch, list):
+        raise HTTPException(status_code=400, detail="'batch' must be a list of invocations")
+
+    results = []
+    for item in batch:
+        if not isinstance(item, dict):
+            results.append({"status": 400, "body": {"detail": "Batch entries must be objects"}})
+            continue
+        try:
+            result = await _invoke(http_request, item, agentcore_session_id, user_id)
+        except HTTPException as e:
+            results.append({"status": e.status_code, "body": {"detail": e.detail}})
+            continue
+
+        if isinstance(result, Response):
+            detail = f"{item.get('method', 'POST').upper()} {item.get('path')} cannot be batched"
+            results.append({"status": 400, "body": {"detail": detail}})
+        elif isinstance(result, BaseModel):
+            results.append({"status": 200, "body": result.model_dump(mode="json")})
+        else:
+            results.append({"status": 200, "body": result})
+    return results
+
+
 @router.post("/invocations")
 async def invocations(http_request: Request, request: dict[str, Any]):
     """
@@ -119,6 +467,8 @@ async def invocations(http_request: Request, request: dict[str, Any]):
             - method: HTTP method (GET, POST, DELETE) - optional, defaults to POST
             - payload: The request payload (optional)
             - path_params: Path parameters as dict (optional, e.g., {"session_id": "abc"})
+            - batch: List of invocations to run in order instead (optional);
+              the response is then a list of {"status", "body"} results
 
     Returns:
         The response from the invoked endpoint
@@ -145,6 +495,14 @@ async def invocations(http_request: Request, request: dict[str, Any]):
             "method": "GET",
             "path_params": {"session_id": "abc123"}
         }
+
+        Batch:
+        {
+            "batch": [
+                {"path": "/health", "method": "GET"},
+                {"path": "/sessions", "method": "GET"}
+            ]
+        }
     """
     # Parse agentcore_session_id, user_id, and project_name from headers
     agentcore_session_id, user_id, project_name = parse_session_and_user_from_headers(http_request)
@@ -212,419 +570,20 @@ async def invocations(http_request: Request, request: dict[str, Any]):
         except Exception as e:
             print(f"⚠️  Warning: Exception during project sync: {e}")
 
-    path = request.get("path")
-    method = request.get("method", "POST").upper()
-    payload = request.get("payload", {})
-    path_params = request.get("path_params", {})
-
-    if not path:
-        raise HTTPException(status_code=400, detail="Missing 'path' parameter")
-
-    # Replace path parameters
-    resolved_path = path
-    for key, value in path_params.items():
-        resolved_path = resolved_path.replace(f"{{{key}}}", str(value))
-
-    # Log the invocation with agentcore session ID prominently
-    if agentcore_session_id:
-        print(f"🔀 Invocation → {method} {resolved_path}")
-        print(f"   🆔 AgentCore Session ID: {agentcore_session_id}")
-        if user_id:
-            print(f"   👤 User ID: {user_id}")
-        session_id_from_path = path_params.get("session_id")
-        if session_id_from_path:
-            print(f"   📋 Path Session ID: {session_id_from_path}")
-    else:
-        # Fallback when no agentcore session ID
-        log_parts = [f"🔀 Invocation → {method} {resolved_path}"]
-        if user_id:
-            log_parts.append(f"user_id={user_id}")
-        session_id_from_path = path_params.get("session_id")
-        if session_id_from_path:
-            log_parts.append(f"session_id={session_id_from_path}")
-        print(" | ".join(log_parts))
-
-    # Route to appropriate endpoint based on path and method
-    try:
-        if path == "/sessions" and method == "POST":
-            # Create session
-            req = CreateSessionRequest(**payload)
-            return await create_session(req)
-
-        elif path == "/sessions" and method == "GET":
-            # List sessions
-            cwd = payload.get("cwd") if payload else None
-            return await list_sessions(cwd)
-
-        elif path == "/sessions/available" and method == "GET":
-            # List available sessions
-            cwd = payload.get("cwd") if payload else None
-            return await list_available_sessions(cwd)
-
-        elif (
-            path.startswith("/sessions/")
-            and path.endswith("/status")
-            and method == "GET"
-        ):
-            # Get session status
-            session_id = path_params.get("session_id")
-            if not session_id:
-                raise HTTPException(
-                    status_code=400, detail="Missing session_id in path_params"
-                )
-            return await get_session_status(session_id)
-
-        elif (
-            path.startswith("/sessions/")
-            and path.endswith("/messages/stream")
-            and method == "POST"
-        ):
-            # Send message with streaming
-            session_id = path_params.get("session_id")
-            if not session_id:
-                raise HTTPException(
-                    status_code=400, detail="Missing session_id in path_params"
-                )
-            req = SendMessageRequest(**payload)
-            from .messages import send_message_stream
-            return await send_message_stream(session_id, req)
-
-        elif (
-            path.startswith("/sessions/")
-            and path.endswith("/messages")
-            and method == "POST"
-        ):
-            # Send message
-            session_id = path_params.get("session_id")
-            if not session_id:
-                raise HTTPException(
-                    status_code=400, detail="Missing session_id in path_params"
-                )
-            req = SendMessageRequest(**payload)
-            return await send_message(session_id, req)
-
-        elif (
-            path.startswith("/sessions/")
-            and path.endswith("/permissions/respond")
-            and method == "POST"
-        ):
-            # Respond to permission
-            session_id = path_params.get("session_id")
-            if not session_id:
-                raise HTTPException(
-                    status_code=400, detail="Missing session_id in path_params"
-                )
-            resp = PermissionResponse(**payload)
-            return await respond_to_permission(session_id, resp)
-
-        elif (
-            path.startswith("/sessions/")
-            and path.endswith("/model")
-            and method == "POST"
-        ):
-            # Set model
-            session_id = path_params.get("session_id")
-            if not session_id:
-                raise HTTPException(
-                    status_code=400, detail="Missing session_id in path_params"
-                )
-            req = SetModelRequest(**payload)
-            return await set_model(session_id, req)
-
-        elif (
-            path.startswith("/sessions/")
-            and path.endswith("/interrupt")
-            and method == "POST"
-        ):
-            # Interrupt session
-            session_id = path_params.get("session_id")
-            if not session_id:
-                raise HTTPException(
-                    status_code=400, detail="Missing session_id in path_params"
-                )
-            return await interrupt_session(session_id)
-
-        elif (
-            path.startswith("/sessions/")
-            and path.endswith("/permission_mode")
-            and method == "POST"
-        ):
-            # Set permission mode
-            session_id = path_params.get("session_id")
-            if not session_id:
-                raise HTTPException(
-                    status_code=400, detail="Missing session_id in path_params"
-                )
-            req = SetPermissionModeRequest(**payload)
-            return await set_permission_mode(session_id, req)
-
-        elif (
-            path.startswith("/sessions/")
-            and path.endswith("/server_info")
-            and method == "GET"
-        ):
-            # Get server info
-            session_id = path_params.get("session_id")
-            if not session_id:
-                raise HTTPException(
-                    status_code=400, detail="Missing session_id in path_params"
-                )
-            return await get_server_info(session_id)
-
-        elif (
-            path.startswith("/sessions/")
-            and path.endswith("/history")
-            and method == "GET"
-        ):
-            # Get session history
-            session_id = path_params.get("session_id")
-            if not session_id:
-                raise HTTPException(
-                    status_code=400, detail="Missing session_id in path_params"
-                )
-            cwd = payload.get("cwd") if payload else None
-            return await get_session_history(session_id, cwd)
-
-        elif path.startswith("/sessions/") and method == "DELETE":
-            # Close session
-            session_id = path_params.get("session_id")
-            if not session_id:
-                raise HTTPException(
-                    status_code=400, detail="Missing session_id in path_params"
-                )
-            return await close_session(session_id)
-
-        elif path == "/files" and method == "GET":
-            # List files
-            file_path = payload.get("path", ".")
-            return await list_files(path=file_path)
-
-        elif path == "/files/info" and method == "GET":
-            # Get file info
-            file_path = payload.get("path")
-            if not file_path:
-                raise HTTPException(status_code=400, detail="Missing 'path' in payload")
-            return await get_file_info(path=file_path)
-
-        elif path == "/files/save" and method == "POST":
-            # Save file
-            req = SaveFileRequest(**payload)
-            return await save_file(req)
-
-        elif path == "/shell/execute" and method == "POST":
-            # Execute shell command (returns streaming response)
-            req = ShellExecuteRequest(**payload)
-            return await execute_command(req)
-
-        elif path == "/shell/cwd" and method == "GET":
-            # Get current working directory
-            return await get_current_directory()
-
-        elif path == "/shell/cwd" and method == "POST":
-            # Set current working directory
-            cwd = payload.get("cwd")
-            if not cwd:
-                raise HTTPException(status_code=400, detail="Missing 'cwd' in payload")
-            return await set_current_directory(cwd)
-
-        elif path == "/terminal/sessions" and method == "POST":
-            # Create terminal session
-            req = TerminalCreateRequest(**payload)
-            return await create_terminal_session(req)
-
-        elif path == "/terminal/sessions" and method == "GET":
-            # List terminal sessions
-            return await list_terminal_sessions()
-
-        elif (
-            path.startswith("/terminal/sessions/")
-            and path.endswith("/stream")
-            and method == "GET"
-        ):
-            # Stream terminal output (SSE)
-            session_id = path_params.get("session_id")
-            if not session_id:
-                raise HTTPException(
-                    status_code=400, detail="Missing session_id in path_params"
-                )
-            return await stream_session_output(session_id)
-
-        elif (
-            path.startswith("/terminal/sessions/")
-            and "/output" in path
-            and method == "GET"
-        ):
-            # Get terminal output
-            session_id = path_params.get("session_id")
-            if not session_id:
-                raise HTTPException(
-                    status_code=400, detail="Missing session_id in path_params"
-                )
-            seq = payload.get("seq", 0) if payload else 0
-            return await get_session_output(session_id, seq)
-
-        elif (
-            path.startswith("/terminal/sessions/")
-            and path.endswith("/input")
-            and method == "POST"
-        ):
-            # Send terminal input
-            session_id = path_params.get("session_id")
-            if not session_id:
-                raise HTTPException(
-                    status_code=400, detail="Missing session_id in path_params"
-                )
-            req = InputRequest(**payload)
-            return await send_input(session_id, req)
-
-        elif (
-            path.startswith("/terminal/sessions/")
-            and path.endswith("/resize")
-            and method == "POST"
-        ):
-            # Resize terminal
-            session_id = path_params.get("session_id")
-            if not session_id:
-                raise HTTPException(
-                    status_code=400, detail="Missing session_id in path_params"
-                )
-            req = ResizeRequest(**payload)
-            return await resize_session(session_id, req)
-
-        elif (
-            path.startswith("/terminal/sessions/")
-            and path.endswith("/status")
-            and method == "GET"
-        ):
-            # Get terminal status
-            session_id = path_params.get("session_id")
-            if not session_id:
-                raise HTTPException(
-                    status_code=400, detail="Missing session_id in path_params"
-                )
-            return await get_terminal_status(session_id)
-
-        elif (
-            path.startswith("/terminal/sessions/")
-            and not path.endswith("/input")
-            and not path.endswith("/resize")
-            and not path.endswith("/status")
-            and "/output" not in path
-            and method == "DELETE"
-        ):
-            # Close terminal session
-            session_id = path_params.get("session_id")
-            if not session_id:
-                raise HTTPException(
-                    status_code=400, detail="Missing session_id in path_params"
-                )
-            return await close_terminal_session(session_id)
-
-        elif path == "/workspace/projects/backup" and method == "POST":
-            # Backup project to S3
-            from .workspace import backup_project, CreateProjectRequest
-            req = CreateProjectRequest(**payload)
-            return await backup_project(req)
-
-        elif path == "/workspace/projects" and method == "POST":
-            # Create project
-            from .workspace import create_project, CreateProjectRequest
-            req = CreateProjectRequest(**payload)
-            return await create_project(req)
-
-        elif path.startswith("/workspace/projects/") and method == "GET":
-            # List projects for user
-            from .workspace import list_projects
-            user_id = path_params.get("user_id")
-            if not user_id:
-                raise HTTPException(
-                    status_code=400, detail="Missing user_id in path_params"
-                )
-            return await list_projects(user_id)
-
-        elif path == "/oauth/github/token" and method == "POST":
-            # Get GitHub OAuth token
-            return await get_github_oauth_token(http_request)
-
-        elif path == "/oauth/github/callback" and method == "GET":
-            # GitHub OAuth callback (3LO flow completion)
-            from .oauth import github_oauth_callback
-
-            # Extract session_id from query_params in request payload
-            query_params = request.get("query_params", {})
-            session_id = query_params.get("session_id")
-            if not session_id:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Missing session_id query parameter"
-                )
-            return await github_oauth_callback(http_request, session_id)
-
-        elif path == "/agentcore/session/stop" and method == "POST":
-            # Stop AgentCore runtime session
-            from .agentcore import stop_agentcore_session
-
-            # Extract qualifier from query_params if provided
-            query_params = request.get("query_params", {})
-            qualifier = query_params.get("qualifier", "DEFAULT")
-            return await stop_agentcore_session(http_request, qualifier)
-
-        elif path == "/github/repositories" and method == "GET":
-            # List GitHub repositories
-            from .oauth import list_github_repositories
-            return await list_github_repositories()
-
-        elif path == "/github/create-project" and method == "POST":
-            # Create project from GitHub repository
-            from .oauth import create_project_from_github
-            # Extract params - try both path_params and query_params for compatibility
-            params = request.get("path_params", {}) or request.get("query_params", {})
-            user_id = params.get("user_id")
-            repository_url = params.get("repository_url")
-            project_name = params.get("project_name")
-            branch = params.get("branch")
-
-            if not user_id or not repository_url:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Missing required parameters: user_id and repository_url"
-                )
-
-            return await create_project_from_github(
-                user_id=user_id,
-                repository_url=repository_url,
-                project_name=project_name,
-                branch=branch
-            )
-
-        elif path == "/health" and method == "GET":
-            # Health check - import here to avoid circular dependency
-            from ..server import health_check
-
-            return await health_check()
-
-        elif path == "/ping" and method == "GET":
-            # Ping endpoint - import here to avoid circular dependency
-            from ..server import ping
-
-            return await ping()
-
-        else:
-            error_msg = f"Unknown path or method: {method} {path}"
-            print(f"❌ Invocation Error (404): {error_msg} | path_params={path_params} | payload_keys={list(payload.keys()) if payload else []}")
-            raise HTTPException(
-                status_code=404,
-                detail=error_msg,
-            )
-
-    except HTTPException as e:
-        # Log HTTPException details
-        if e.status_code == 404:
-            print(f"❌ Invocation HTTPException (404): {e.detail}")
-        elif e.status_code >= 400:
-            print(f"❌ Invocation HTTPException ({e.status_code}): {e.detail}")
-        raise
-    except Exception as e:
-        error_detail = f"Invocation error: {str(e)}"
-        print(f"❌ Invocation Exception (500): {error_detail} | path={path} | method={method}")
-        raise HTTPException(status_code=500, detail=error_detail)
+    batch = request.get("batch")
+    if batch is not None:
+        return await _invoke_batch(http_request, batch, agentcore_session_id, user_id)
+
+    result = await _invoke(http_request, request, agentcore_session_id, user_id)
+
+    # This route declares no response model, so FastAPI would walk
+    # returned models with jsonable_encoder; serialize them in
+    # pydantic-core instead
+    if isinstance(result, BaseModel):
+        return Response(
+            content=result.model_dump_json(),
+            media_type="application/json",
+            # Status polls carry the same Retry-After hint as the REST route
+            headers=retry_after_headers(result) if isinstance(result, SessionStatus) else None,
+        )
+    return result
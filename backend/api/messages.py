@@ -6,7 +6,10 @@ checking session status, and managing session models.
 """
 
 import json
-from fastapi import APIRouter
+import math
+from contextlib import aclosing
+
+from fastapi import APIRouter, Response
 from fastapi.responses import StreamingResponse
 
 from ..core import SessionManager
@@ -18,6 +21,11 @@ from ..models import (
     SetPermissionModeRequest,
 )
 
+try:
+    import orjson  # optional, faster serialization of stream events
+except ImportError:
+    orjson = None
+
 router = APIRouter()
 
 
@@ -28,8 +36,27 @@ def get_session_manager() -> SessionManager:
     return session_manager
 
 
+def read_session_status(session_id: str) -> SessionStatus:
+    """
+    Get the status of a session without an HTTP response to annotate.
+
+    Args:
+        session_id: The session ID
+
+    Returns:
+        Session status including pending permissions
+    """
+    manager = get_session_manager()
+    return manager.get_session(session_id).get_status()
+
+
+def retry_after_headers(status: SessionStatus) -> dict[str, str]:
+    """Retry-After header carrying a status's polling hint, in whole seconds."""
+    return {"Retry-After": str(math.ceil(status.retry_after_ms / 1000))}
+
+
 @router.get("/sessions/{session_id}/status", response_model=SessionStatus)
-async def get_session_status(session_id: str):
+async def get_session_status(session_id: str, response: Response):
     """
     Get the status of a session.
 
@@ -39,9 +66,9 @@ async def get_session_status(session_id: str):
     Returns:
         Session status including pending permissions
     """
-    manager = get_session_manager()
-    session = manager.get_session(session_id)
-    return session.get_status()
+    status = read_session_status(session_id)
+    response.headers.update(retry_after_headers(status))
+    return status
 
 
 @router.post("/sessions/{session_id}/messages", response_model=SendMessageResponse)
@@ -61,7 +88,6 @@ async def send_message(session_id: str, request: SendMessageRequest):
     return await session.send_message(request.message)
 
 
-@router.post("/sessions/{session_id}/messages/stream")
 def safe_json_dumps(obj):
     """
     Safely serialize objects to JSON, handling non-serializable objects.
@@ -79,9 +105,14 @@ def safe_json_dumps(obj):
         # Handle other non-serializable types
         return str(o)
 
+    if orjson is not None:
+        return orjson.dumps(
+            obj, default=default_handler, option=orjson.OPT_NON_STR_KEYS
+        ).decode()
     return json.dumps(obj, default=default_handler)
 
 
+@router.post("/sessions/{session_id}/messages/stream")
 async def send_message_stream(session_id: str, request: SendMessageRequest):
     """
     Send a message in a session with streaming response (SSE).
@@ -99,10 +130,13 @@ async def send_message_stream(session_id: str, request: SendMessageRequest):
     async def event_generator():
         """Generate SSE events from the agent response."""
         try:
-            async for event in session.send_message_stream(request.message):
-                # Format as SSE: data: {json}\n\n
-                # Use safe_json_dumps to handle non-serializable objects
-                yield f"data: {safe_json_dumps(event)}\n\n"
+            # Close the turn as soon as this stream ends (including on client
+            # disconnect) so its query lock is released right away
+            async with aclosing(session.send_message_stream(request.message)) as events:
+                async for event in events:
+                    # Format as SSE: data: {json}\n\n
+                    # Use safe_json_dumps to handle non-serializable objects
+                    yield f"data: {safe_json_dumps(event)}\n\n"
         except Exception as e:
             # Send error event
             error_event = {
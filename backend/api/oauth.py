@@ -8,6 +8,7 @@ import asyncio
 import logging
 import os
 import shutil
+import time
 from typing import Optional
 
 import boto3
@@ -18,17 +19,38 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# How long a 'gh auth status' result is reused; /health is polled by every
+# open web client, and each check is a subprocess plus a request to GitHub
+GH_AUTH_STATUS_TTL = 30.0
+
+_gh_auth_status_cache: Optional[tuple[float, dict]] = None
+
 
 async def check_gh_auth_status() -> dict:
     """
     Check GitHub CLI authentication status.
 
+    Results are cached for GH_AUTH_STATUS_TTL seconds.
+
     Returns:
         dict: Status information
             - authenticated: bool - Whether gh is authenticated
             - username: str | None - GitHub username if authenticated
             - message: str - Status message
     """
+    global _gh_auth_status_cache
+
+    now = time.monotonic()
+    if _gh_auth_status_cache and now - _gh_auth_status_cache[0] < GH_AUTH_STATUS_TTL:
+        return _gh_auth_status_cache[1]
+
+    status = await _run_gh_auth_status()
+    _gh_auth_status_cache = (now, status)
+    return status
+
+
+async def _run_gh_auth_status() -> dict:
+    """Run 'gh auth status' and parse the result."""
     # Check if gh is installed
     if not shutil.which("gh"):
         return {
@@ -98,6 +120,8 @@ async def initialize_gh_auth(access_token: str) -> dict:
     Raises:
         Exception: If gh command fails
     """
+    global _gh_auth_status_cache
+
     # Check if gh is installed
     if not shutil.which("gh"):
         logger.warning("gh CLI is not installed, skipping authentication setup")
@@ -120,6 +144,7 @@ async def initialize_gh_auth(access_token: str) -> dict:
 
         # Send token to stdin and close
         stdout, stderr = await process.communicate(input=access_token.encode())
+        _gh_auth_status_cache = None  # Next status check sees the new login
 
         if process.returncode == 0:
             logger.info("Successfully initialized GitHub CLI authentication")
@@ -12,6 +12,9 @@ from ..models import PermissionResponse
 
 router = APIRouter()
 
+# Upper bound for a single permission long-poll
+MAX_PERMISSION_WAIT = 60.0
+
 
 def get_session_manager() -> SessionManager:
     """Get the global session manager instance."""
@@ -20,6 +23,29 @@ def get_session_manager() -> SessionManager:
     return session_manager
 
 
+@router.get("/sessions/{session_id}/permissions/wait")
+async def wait_for_permission(session_id: str, timeout: float = 30.0):
+    """
+    Long-poll for a pending permission request.
+
+    Returns as soon as the session raises a permission request that has not
+    been answered yet, or with ``pending_permission: null`` after the timeout.
+
+    Args:
+        session_id: The session ID
+        timeout: Maximum seconds to wait (capped at MAX_PERMISSION_WAIT)
+
+    Returns:
+        The pending permission request, if any
+    """
+    manager = get_session_manager()
+    session = manager.get_session(session_id)
+    pending = await session.wait_for_permission(
+        min(max(timeout, 0.0), MAX_PERMISSION_WAIT)
+    )
+    return {"pending_permission": pending}
+
+
 @router.post("/sessions/{session_id}/permissions/respond")
 async def respond_to_permission(session_id: str, response: PermissionResponse):
     """
@@ -6,8 +6,7 @@ creating, listing, and closing sessions.
 """
 
 import json
-from datetime import datetime, timezone
-from pathlib import Path
+import os
 from typing import Optional
 
 from fastapi import APIRouter, HTTPException
@@ -51,9 +50,9 @@ async def create_session(request: CreateSessionRequest):
         cwd=request.cwd,
     )
 
-    return CreateSessionResponse(
+    return CreateSessionResponse.model_construct(
         session_id=session_id,
-        created_at=datetime.now(timezone.utc).isoformat(),
+        created_at=manager.sessions[session_id].created_at_iso,
         status="connected",
     )
 
@@ -71,7 +70,7 @@ async def list_sessions(cwd: Optional[str] = None):
     """
     manager = get_session_manager()
     sessions = manager.list_sessions(cwd=cwd)
-    return ListSessionsResponse(sessions=sessions)
+    return ListSessionsResponse.model_construct(sessions=sessions)
 
 
 @router.get("/sessions/available")
@@ -86,7 +85,7 @@ async def list_available_sessions(cwd: Optional[str] = None):
         List of available sessions
     """
     manager = get_session_manager()
-    sessions = manager.list_available_sessions(cwd=cwd)
+    sessions = await manager.list_available_sessions(cwd=cwd)
     return {"sessions": sessions}
 
 
@@ -102,7 +101,8 @@ async def get_session_history(session_id: str, cwd: Optional[str] = None):
     Returns:
         Session history with messages and metadata
     """
-    base_dir = Path.home() / ".claude" / "projects"
+    base_dir = str(get_session_manager().session_dir)
+    file_name = f"{session_id}.jsonl"
 
     # Find the session file
     session_file = None
@@ -110,19 +110,23 @@ async def get_session_history(session_id: str, cwd: Optional[str] = None):
     # If cwd is provided, try to find it directly
     if cwd:
         path_key = cwd.replace("/", "-").replace("_", "-")
-        potential_file = base_dir / path_key / f"{session_id}.jsonl"
-        if potential_file.exists():
+        potential_file = os.path.join(base_dir, path_key, file_name)
+        if os.path.exists(potential_file):
             session_file = potential_file
 
     # If not found, search all project directories
     if not session_file:
-        for project_dir in base_dir.iterdir():
-            if not project_dir.is_dir():
-                continue
-            potential_file = project_dir / f"{session_id}.jsonl"
-            if potential_file.exists():
-                session_file = potential_file
-                break
+        try:
+            with os.scandir(base_dir) as it:
+                for project_dir in it:
+                    if not project_dir.is_dir():
+                        continue
+                    potential_file = os.path.join(project_dir.path, file_name)
+                    if os.path.exists(potential_file):
+                        session_file = potential_file
+                        break
+        except OSError:
+            pass  # No session directory yet
 
     if not session_file:
         raise HTTPException(status_code=404, detail="Session history not found")
@@ -265,16 +269,23 @@ async def get_server_info(session_id: str):
 
 
 @router.delete("/sessions/{session_id}")
-async def close_session(session_id: str):
+async def close_session(session_id: str, wait: bool = False):
     """
     Close a session.
 
+    The session is removed right away and its SDK client is disconnected in
+    the background, unless the caller asks to wait for the disconnect.
+
     Args:
         session_id: The session ID
+        wait: Return only after the SDK client has disconnected
 
     Returns:
         Success message
     """
     manager = get_session_manager()
-    await manager.close_session(session_id)
-    return {"status": "closed"}
+    if wait:
+        await manager.close_session(session_id)
+        return {"status": "closed"}
+    manager.close_session_in_background(session_id)
+    return {"status": "closing"}
@@ -7,8 +7,10 @@ Provides REST API endpoints for executing shell commands with streaming output.
 import asyncio
 import os
 import re
-from typing import Dict
-from fastapi import APIRouter, HTTPException
+import urllib.parse
+import zlib
+from typing import Dict, Optional
+from fastapi import APIRouter, Header, HTTPException
 from fastapi.responses import StreamingResponse, JSONResponse
 from pydantic import BaseModel
 
@@ -17,6 +19,7 @@ class ShellExecuteRequest(BaseModel):
     """Request to execute a shell command."""
     command: str
     cwd: str = None
+    compress: bool = False  # Gzip the output, if Accept-Encoding also allows it
 
 
 class ShellCwdResponse(BaseModel):
@@ -26,6 +29,12 @@ class ShellCwdResponse(BaseModel):
 
 router = APIRouter()
 
+# Largest chunk of command output sent to the client in one piece
+SHELL_OUTPUT_CHUNK_SIZE = 65536
+
+# zlib level used when the client asks for gzip-encoded output
+SHELL_GZIP_LEVEL = 6
+
 # Store current directory per session (in production, use session management)
 _cwd_store: Dict[str, str] = {}
 
@@ -50,6 +59,14 @@ def parse_cd_command(command: str):
     return None
 
 
+def resolve_cd_path(cd_path: str, cwd: str) -> str:
+    """Resolve a cd target against the current working directory."""
+    new_path = os.path.expanduser(cd_path)
+    if not os.path.isabs(new_path):
+        new_path = os.path.join(cwd, new_path)
+    return os.path.normpath(new_path)
+
+
 async def execute_command_stream(command: str, cwd: str):
     """
     Execute a shell command and stream the output.
@@ -70,11 +87,7 @@ async def execute_command_stream(command: str, cwd: str):
                     yield b"[cd - not supported in this shell]\n"
                     return
 
-                new_path = os.path.expanduser(cd_path)
-                if not os.path.isabs(new_path):
-                    new_path = os.path.join(cwd, new_path)
-
-                new_path = os.path.normpath(new_path)
+                new_path = resolve_cd_path(cd_path, cwd)
 
                 if os.path.isdir(new_path):
                     # Update cwd in store
@@ -96,12 +109,14 @@ async def execute_command_stream(command: str, cwd: str):
             cwd=cwd
         )
 
-        # Stream output line by line
+        # Stream whatever output is available, up to 64 KB per chunk: large
+        # outputs go out in few big chunks, a slow command's lines still
+        # show up as soon as they are printed
         while True:
-            line = await process.stdout.readline()
-            if not line:
+            chunk = await process.stdout.read(SHELL_OUTPUT_CHUNK_SIZE)
+            if not chunk:
                 break
-            yield line
+            yield chunk
 
         # Wait for process to complete
         await process.wait()
@@ -114,13 +129,61 @@ async def execute_command_stream(command: str, cwd: str):
         yield f"\n[Error: {str(e)}]\n".encode('utf-8')
 
 
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """
+    Check whether an Accept-Encoding header allows a gzip response.
+
+    An explicit gzip entry decides; otherwise a "*" entry does. Entries
+    with q=0 (or an unparseable q-value) refuse the encoding.
+    """
+    if not accept_encoding:
+        return False
+    wildcard = False
+    for entry in accept_encoding.split(","):
+        coding, _, params = entry.partition(";")
+        coding = coding.strip().lower()
+        if coding not in ("gzip", "x-gzip", "*"):
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding == "*":
+            wildcard = q > 0
+        else:
+            return q > 0
+    return wildcard
+
+
+async def gzip_stream(chunks):
+    """
+    Gzip-compress a byte stream chunk by chunk.
+
+    Each chunk is sync-flushed so the client can decode and show it right
+    away instead of waiting for the compressor's buffer to fill.
+    """
+    compressor = zlib.compressobj(SHELL_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
 @router.post("/shell/execute")
-async def execute_command(request: ShellExecuteRequest):
+async def execute_command(
+    request: ShellExecuteRequest,
+    accept_encoding: Optional[str] = Header(None)
+):
     """
     Execute a shell command with streaming output.
 
     Args:
-        request: Command and optional working directory
+        request: Command, optional working directory and compression opt-in
+        accept_encoding: Client Accept-Encoding; must allow gzip for the
+            output to be compressed
 
     Returns:
         Streaming response with command output
@@ -131,9 +194,31 @@ async def execute_command(request: ShellExecuteRequest):
     # Get current working directory
     cwd = request.cwd if request.cwd else get_cwd()
 
+    headers = {
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"  # Disable nginx buffering
+    }
+
+    # Report the directory a successful cd moves to, so clients can update
+    # their prompt without a follow-up /shell/cwd request
+    cd_path = parse_cd_command(request.command)
+    if cd_path and cd_path != '-':
+        new_path = resolve_cd_path(cd_path, cwd)
+        if os.path.isdir(new_path):
+            headers["X-Shell-Cwd"] = urllib.parse.quote(new_path)
+
+    stream = execute_command_stream(request.command, cwd)
+    # Only on request: HTTP clients accept gzip by default, and compressing
+    # output on localhost or behind a compressing proxy is wasted work
+    if request.compress and accepts_gzip(accept_encoding):
+        stream = gzip_stream(stream)
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+
     return StreamingResponse(
-        execute_command_stream(request.command, cwd),
-        media_type="text/plain"
+        stream,
+        media_type="text/plain",
+        headers=headers
     )
 
 
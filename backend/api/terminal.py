@@ -3,6 +3,7 @@ from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional
 import asyncio
+import base64
 import json
 
 
@@ -13,19 +14,31 @@ class CreateSessionRequest(BaseModel):
     shell: str = "bash"
 
 
+# Output/input encodings this server understands; "base64" carries raw PTY
+# bytes so clients can skip the UTF-8 decode/encode round trip
+SUPPORTED_ENCODINGS = ["utf-8", "base64"]
+
+
 class CreateSessionResponse(BaseModel):
     session_id: str
     status: str
+    encodings: list[str] = SUPPORTED_ENCODINGS
+    # Input requests carrying "seq" are applied in order, so clients may
+    # have several in flight at once
+    ordered_input: bool = True
 
 
 class SessionOutputResponse(BaseModel):
-    output: str
+    output: str = ""
+    output_b64: Optional[str] = None
     seq: int
     exit_code: Optional[int]
 
 
 class InputRequest(BaseModel):
-    data: str
+    data: str = ""
+    data_b64: Optional[str] = None
+    seq: Optional[int] = None
 
 
 class ResizeRequest(BaseModel):
@@ -69,7 +82,7 @@ async def create_session(request: CreateSessionRequest):
 
 
 @router.get("/terminal/sessions/{session_id}/output", response_model=SessionOutputResponse)
-async def get_session_output(session_id: str, seq: int = 0):
+async def get_session_output(session_id: str, seq: int = 0, encoding: str = "utf-8"):
     from ..server import pty_manager
 
     if not pty_manager:
@@ -80,6 +93,14 @@ async def get_session_output(session_id: str, seq: int = 0):
         raise HTTPException(status_code=404, detail="Session not found")
 
     try:
+        if encoding == "base64":
+            output_bytes, new_seq = session.get_output_bytes_since(seq)
+            return SessionOutputResponse(
+                output_b64=base64.b64encode(output_bytes).decode("ascii"),
+                seq=new_seq,
+                exit_code=session.exit_code
+            )
+
         output, new_seq = session.get_output_since(seq)
         return SessionOutputResponse(
             output=output,
@@ -105,7 +126,10 @@ async def send_input(session_id: str, request: InputRequest):
         raise HTTPException(status_code=400, detail="Session is not alive")
 
     try:
-        await session.write_input(request.data)
+        if request.data_b64 is not None:
+            await session.write_input(base64.b64decode(request.data_b64), request.seq)
+        else:
+            await session.write_input(request.data, request.seq)
         return {"status": "ok"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -176,11 +200,20 @@ async def list_sessions():
     return {"sessions": sessions, "count": len(sessions)}
 
 
+# Idle interval after which an SSE comment is sent so clients can tell a quiet
+# terminal apart from a stream stalled by a buffering proxy
+SSE_HEARTBEAT_INTERVAL = 15.0
+
+
 @router.get("/terminal/sessions/{session_id}/stream")
-async def stream_session_output(session_id: str):
+async def stream_session_output(session_id: str, seq: int = 0, encoding: str = "utf-8"):
     """
     Server-Sent Events (SSE) endpoint for streaming terminal output.
     This provides a more efficient alternative to polling.
+
+    Pass the last seen ``seq`` to resume a dropped stream without replaying
+    output the client already has. With ``encoding="base64"`` events carry
+    raw PTY bytes in ``output_b64`` instead of decoded text in ``output``.
     """
     from ..server import pty_manager
 
@@ -192,24 +225,37 @@ async def stream_session_output(session_id: str):
         raise HTTPException(status_code=404, detail="Session not found")
 
     async def event_generator():
-        seq = 0
+        nonlocal seq
+        loop = asyncio.get_running_loop()
+        last_sent = loop.time()
         try:
             while session.is_alive():
                 # Get output since last sequence
-                output, new_seq = session.get_output_since(seq)
+                output, new_seq = session.get_output_bytes_since(seq)
 
                 if output:
                     # Send SSE event with output data
                     event_data = {
-                        "output": output,
                         "seq": new_seq,
                         "exit_code": session.exit_code
                     }
+                    if encoding == "base64":
+                        event_data["output_b64"] = base64.b64encode(output).decode("ascii")
+                    else:
+                        event_data["output"] = output.decode("utf-8", errors="replace")
                     yield f"data: {json.dumps(event_data)}\n\n"
                     seq = new_seq
-
-                # Small delay to avoid busy-waiting
-                await asyncio.sleep(0.05)
+                    last_sent = loop.time()
+                elif loop.time() - last_sent >= SSE_HEARTBEAT_INTERVAL:
+                    # SSE comment line, ignored by clients but keeps bytes flowing
+                    yield ": keep-alive\n\n"
+                    last_sent = loop.time()
+
+                # Sleep until there is new output or the session ends; wake
+                # up in time for the next heartbeat either way
+                await session.wait_for_output(
+                    seq, max(0.0, last_sent + SSE_HEARTBEAT_INTERVAL - loop.time())
+                )
 
             # Send final event when session exits
             final_event = {
@@ -1,5 +1,5 @@
 import asyncio
-from datetime import datetime, timedelta
+import time
 from typing import Dict, Optional
 from .pty_session import PTYSession
 
@@ -27,9 +27,10 @@ class PTYManager:
             except asyncio.CancelledError:
                 pass
 
-        for session in list(self.sessions.values()):
-            await session.close()
+        # Close concurrently; each close may wait up to a second for the shell
+        sessions = list(self.sessions.values())
         self.sessions.clear()
+        await asyncio.gather(*(s.close() for s in sessions), return_exceptions=True)
 
     async def _cleanup_loop(self):
         while self._running:
@@ -42,15 +43,17 @@ class PTYManager:
                 await asyncio.sleep(60)
 
     async def _cleanup_inactive_sessions(self):
-        timeout_threshold = datetime.utcnow() - timedelta(minutes=self.session_timeout_minutes)
+        timeout_threshold = time.monotonic() - self.session_timeout_minutes * 60
         sessions_to_remove = []
 
         for session_id, session in self.sessions.items():
-            if session.last_activity < timeout_threshold or not session.is_alive():
+            if session.last_activity_monotonic < timeout_threshold or not session.is_alive():
                 sessions_to_remove.append(session_id)
 
-        for session_id in sessions_to_remove:
-            await self.close_session(session_id)
+        await asyncio.gather(
+            *(self.close_session(session_id) for session_id in sessions_to_remove),
+            return_exceptions=True,
+        )
 
     async def create_session(
         self,
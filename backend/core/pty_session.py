@@ -1,12 +1,17 @@
 import asyncio
 import os
+import time
 import uuid
 from collections import deque
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional, Deque
 import pexpect
 from pexpect import spawn
 
+# How long a sequenced input write waits for an earlier, missing write before
+# giving up on it (e.g. the request carrying it was lost)
+INPUT_REORDER_TIMEOUT = 1.0
+
 
 class PTYSession:
     def __init__(
@@ -29,11 +34,28 @@ class PTYSession:
         self.output_buffer: Deque[bytes] = deque(maxlen=max_output_lines)
         self.output_seq: int = 0
         self.created_at = datetime.utcnow()
-        self.last_activity = datetime.utcnow()
+        # Activity is tracked on the monotonic clock; see last_activity
+        self._created_monotonic = time.monotonic()
+        self.last_activity_monotonic = self._created_monotonic
         self.exit_code: Optional[int] = None
         self._running = False
         self._output_task: Optional[asyncio.Task] = None
 
+        # Clients may pipeline input requests; sequenced writes are applied
+        # in order regardless of the order the requests arrive in
+        self._next_input_seq = 0
+        self._input_order = asyncio.Condition()
+
+        # Notified on new output and on exit so streams don't have to poll
+        self._output_ready = asyncio.Condition()
+
+    @property
+    def last_activity(self) -> datetime:
+        """Wall-clock time of the last activity, derived from the monotonic clock."""
+        return self.created_at + timedelta(
+            seconds=self.last_activity_monotonic - self._created_monotonic
+        )
+
     async def start(self):
         if self._running:
             return
@@ -68,7 +90,8 @@ class PTYSession:
                 if output:
                     self.output_buffer.append(output.encode('utf-8'))
                     self.output_seq += 1
-                    self.last_activity = datetime.utcnow()
+                    self.last_activity_monotonic = time.monotonic()
+                    await self._notify_output()
             except pexpect.TIMEOUT:
                 await asyncio.sleep(0.05)
             except (pexpect.EOF, OSError):
@@ -79,14 +102,54 @@ class PTYSession:
         if self.process and not self.process.isalive():
             self.exit_code = self.process.exitstatus
             self._running = False
+        await self._notify_output()
+
+    async def _notify_output(self):
+        async with self._output_ready:
+            self._output_ready.notify_all()
+
+    async def wait_for_output(self, seq: int, timeout: float):
+        """Wait until output newer than ``seq`` exists, the session ends, or timeout."""
+        async with self._output_ready:
+            try:
+                await asyncio.wait_for(
+                    self._output_ready.wait_for(
+                        lambda: self.output_seq > seq or not self.is_alive()
+                    ),
+                    timeout
+                )
+            except asyncio.TimeoutError:
+                pass
 
-    async def write_input(self, data: str):
+    async def write_input(self, data: str | bytes, seq: Optional[int] = None):
         if not self._running or not self.process:
             raise RuntimeError("Session not running")
 
+        if seq is None:
+            await self._write(data)
+            return
+
+        async with self._input_order:
+            try:
+                await asyncio.wait_for(
+                    self._input_order.wait_for(lambda: seq <= self._next_input_seq),
+                    INPUT_REORDER_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                pass  # An earlier write never arrived; don't stall behind it
+
+            await self._write(data)
+            self._next_input_seq = max(self._next_input_seq, seq + 1)
+            self._input_order.notify_all()
+
+    async def _write(self, data: str | bytes):
         loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, self.process.send, data)
-        self.last_activity = datetime.utcnow()
+        if isinstance(data, bytes):
+            # Raw bytes bypass the spawn's text encoder
+            await loop.run_in_executor(None, os.write, self.process.child_fd, data)
+        else:
+            await loop.run_in_executor(None, self.process.send, data)
+        self.last_activity_monotonic = time.monotonic()
 
     async def resize(self, rows: int, cols: int):
         if not self._running or not self.process:
@@ -101,22 +164,27 @@ class PTYSession:
             rows,
             cols
         )
-        self.last_activity = datetime.utcnow()
+        self.last_activity_monotonic = time.monotonic()
 
-    def get_output_since(self, seq: int) -> tuple[str, int]:
+    def get_output_bytes_since(self, seq: int) -> tuple[bytes, int]:
         if seq < self.output_seq - len(self.output_buffer):
             seq = self.output_seq - len(self.output_buffer)
 
         start_idx = max(0, len(self.output_buffer) - (self.output_seq - seq))
         output_bytes = b''.join(list(self.output_buffer)[start_idx:])
 
-        return output_bytes.decode('utf-8', errors='replace'), self.output_seq
+        return output_bytes, self.output_seq
+
+    def get_output_since(self, seq: int) -> tuple[str, int]:
+        output_bytes, new_seq = self.get_output_bytes_since(seq)
+        return output_bytes.decode('utf-8', errors='replace'), new_seq
 
     def is_alive(self) -> bool:
         return self._running and (self.process is not None and self.process.isalive())
 
     async def close(self):
         self._running = False
+        await self._notify_output()
 
         if self._output_task:
             self._output_task.cancel()
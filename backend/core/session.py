@@ -7,9 +7,14 @@ connection, permission callbacks, and conversation state.
 """
 
 import asyncio
+import dataclasses
+import heapq
+import math
 import os
-import uuid
-from datetime import datetime, timezone
+import random
+import time
+from contextlib import aclosing
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Optional
 
@@ -32,24 +37,72 @@ from claude_agent_sdk import (
 
 from ..models import MessageBlock, PermissionRequest, SendMessageResponse, SessionStatus
 
+# Default model for sessions that don't specify one (read once at startup)
+DEFAULT_MODEL = os.environ.get("ANTHROPIC_MODEL")
+
+# Status poll hint: doubles from the base for each poll that sees no change,
+# up to the max, plus up to 50% jitter so clients don't poll in lockstep
+STATUS_POLL_BASE_MS = 250
+STATUS_POLL_MAX_MS = 8000
+# Distinct backoff steps, from the base up to the max
+STATUS_POLL_STEPS = (STATUS_POLL_MAX_MS // STATUS_POLL_BASE_MS).bit_length()
+# Consecutive polls arriving before any suggested delay has passed that are
+# still served; later ones are answered with 429
+STATUS_POLL_EARLY_LIMIT = 10
+# Outstanding retry_after_ms hints remembered per session (one per poller)
+STATUS_POLL_HINTS_MAX = 64
+
+# Read-only tools that never need the user's permission
+AUTO_ALLOW_TOOLS = frozenset({"Read", "Glob", "Grep"})
+
+# Shared plain "allow" result; the SDK only reads it, and it carries no
+# updated input or permissions
+_ALLOW = PermissionResultAllow()
+
+
+def suggestion_to_dict(suggestion: Any) -> Any:
+    """
+    Convert an SDK permission suggestion to plain JSON-ready data.
+
+    Nested dataclasses (e.g. permission rules) are converted as well, so the
+    pending permission serializes without per-object fallbacks.
+    """
+    if dataclasses.is_dataclass(suggestion):
+        return dataclasses.asdict(suggestion)
+    return suggestion.__dict__ if hasattr(suggestion, "__dict__") else suggestion
+
+
+# Custom system prompt appended to the Claude Code preset
+CUSTOM_PROMPT_FILE = Path(__file__).parent.parent / "claude_system_prompt.md"
+
+# (st_mtime_ns, content) of the last custom prompt read
+_custom_prompt_cache: Optional[tuple[int, Optional[str]]] = None
+
 
 def load_custom_system_prompt() -> Optional[str]:
     """
     Load custom system prompt from backend/claude_system_prompt.md.
 
+    The file is only re-read when its modification time changes, so
+    connecting a session normally costs a single stat().
+
     Returns:
         The content of the file if it exists, None otherwise.
     """
+    global _custom_prompt_cache
     try:
-        # Get the backend directory path
-        backend_dir = Path(__file__).parent.parent
-        prompt_file = backend_dir / "claude_system_prompt.md"
-
-        if prompt_file.exists():
-            with open(prompt_file, encoding="utf-8") as f:
-                content = f.read().strip()
-                if content:
-                    return content
+        try:
+            mtime_ns = os.stat(CUSTOM_PROMPT_FILE).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+        if _custom_prompt_cache is not None and _custom_prompt_cache[0] == mtime_ns:
+            return _custom_prompt_cache[1]
+
+        with open(CUSTOM_PROMPT_FILE, encoding="utf-8") as f:
+            content = f.read().strip() or None
+        _custom_prompt_cache = (mtime_ns, content)
+        return content
     except Exception as e:
         # Log error but don't fail session creation
         import logging
@@ -66,6 +119,38 @@ class AgentSession:
     for one interactive session.
     """
 
+    __slots__ = (
+        "session_id",
+        "user_id",
+        "client",
+        "created_at",
+        "created_at_iso",
+        "_created_monotonic",
+        "last_activity_monotonic",
+        "status",
+        "message_count",
+        "cwd",
+        "pending_permission",
+        "pending_suggestions",
+        "permission_event",
+        "_permission_seq",
+        "permission_requested",
+        "permission_result",
+        "model",
+        "background_model",
+        "current_model",
+        "enable_proxy",
+        "server_port",
+        "server_info",
+        "_status_cache",
+        "_status_polls",
+        "_status_polled_activity",
+        "_turn_progress",
+        "_status_hints",
+        "_status_early_polls",
+        "_query_lock",
+    )
+
     def __init__(
         self,
         session_id: str,
@@ -92,19 +177,29 @@ class AgentSession:
         self.user_id = user_id
         self.client: Optional[ClaudeSDKClient] = None
         self.created_at = datetime.now(timezone.utc)
-        self.last_activity = datetime.now(timezone.utc)
+        self.created_at_iso = self.created_at.isoformat()
+        # Activity is tracked on the monotonic clock; see last_activity
+        self._created_monotonic = time.monotonic()
+        self.last_activity_monotonic = self._created_monotonic
         self.status = "initializing"
         self.message_count = 0
 
         # Permission management
         self.pending_permission: Optional[dict[str, Any]] = None
-        self.permission_event: Optional[asyncio.Event] = None
+        self.pending_suggestions: list[Any] = []  # SDK objects behind pending_permission
+        self.permission_event = asyncio.Event()  # Reused for every request
+        self._permission_seq = 0
         self.permission_result: Optional[Any] = None
+        # Set while a permission request is waiting for a client response
+        self.permission_requested = asyncio.Event()
+
+        # Serializes turns; the SDK client handles one query at a time
+        self._query_lock = asyncio.Lock()
 
         # Session configuration
         self.cwd = cwd
         # Model: use provided, or env var, or None (SDK default)
-        self.model = model or os.environ.get("ANTHROPIC_MODEL")
+        self.model = model or DEFAULT_MODEL
         self.background_model = background_model  # Background model for agents
         self.current_model = self.model  # Track current model for status
 
@@ -115,6 +210,34 @@ class AgentSession:
         # Server info cache
         self.server_info: Optional[dict[str, Any]] = None
 
+        # (status, pending_permission, current_model, SessionStatus per
+        # backoff step) last reported by get_status
+        self._status_cache: Optional[tuple] = None
+        # Steps taken by the agent (turn started, SDK message received);
+        # unlike last_activity_monotonic, client requests don't bump it
+        self._turn_progress = 0
+        # Consecutive status polls that saw no change or agent progress
+        self._status_polls = 0
+        self._status_polled_activity = self._turn_progress
+        # Heap of monotonic times until which served polls were told to
+        # wait, and how many polls in a row have come in before all of them.
+        # Each poller follows its own hint, so a poll is only early if no
+        # outstanding hint allows it yet
+        self._status_hints: list[float] = []
+        self._status_early_polls = 0
+
+    @property
+    def last_activity(self) -> datetime:
+        """Wall-clock time of the last activity, derived from the monotonic clock."""
+        return self.created_at + timedelta(
+            seconds=self.last_activity_monotonic - self._created_monotonic
+        )
+
+    @property
+    def is_busy(self) -> bool:
+        """Whether a query is running or waiting on a permission decision."""
+        return self._query_lock.locked() or bool(self.pending_permission)
+
     async def connect(self, resume_session_id: Optional[str] = None):
         """
         Connect the SDK client and initialize the session.
@@ -273,37 +396,40 @@ class AgentSession:
             Permission result (allow or deny)
         """
         # Auto-allow read-only operations
-        if tool_name in ["Read", "Glob", "Grep"]:
-            return PermissionResultAllow()
-
-        # Create permission request
-        request_id = str(uuid.uuid4())
+        if tool_name in AUTO_ALLOW_TOOLS:
+            return _ALLOW
+
+        # Create permission request; the SDK's suggestion objects are kept
+        # so approving them doesn't need to rebuild them from the dict form
+        self._permission_seq += 1
+        request_id = f"{self.session_id}-{self._permission_seq}"
+        self.pending_suggestions = list(context.suggestions)
         self.pending_permission = {
             "request_id": request_id,
             "tool_name": tool_name,
             "tool_input": input_data,
-            "suggestions": [
-                s.__dict__ if hasattr(s, "__dict__") else s for s in context.suggestions
-            ],
+            "suggestions": [suggestion_to_dict(s) for s in self.pending_suggestions],
         }
 
-        # Create event to wait for response
-        self.permission_event = asyncio.Event()
+        # Reset event to wait for response
+        self.permission_event.clear()
         self.permission_result = None
+        self.permission_requested.set()
 
         # Wait for client to respond (with timeout)
         try:
-            await asyncio.wait_for(
-                self.permission_event.wait(), timeout=300
-            )  # 5 minute timeout
+            async with asyncio.timeout(300):  # 5 minute timeout
+                await self.permission_event.wait()
         except asyncio.TimeoutError:
             self.pending_permission = None
+            self.pending_suggestions = []
+            self.permission_requested.clear()
             return PermissionResultDeny(message="Permission request timed out")
 
         # Get result
         result = self.permission_result
         self.pending_permission = None
-        self.permission_event = None
+        self.pending_suggestions = []
         self.permission_result = None
 
         return result
@@ -331,30 +457,50 @@ class AgentSession:
             )
 
         if allowed:
-            if apply_suggestions and self.pending_permission["suggestions"]:
-                # Apply suggestions by converting them back to PermissionUpdate objects
+            if apply_suggestions and self.pending_suggestions:
+                # Older SDKs pass suggestions as plain dicts
                 from claude_agent_sdk import PermissionUpdate
 
-                suggestions = []
-                for s in self.pending_permission["suggestions"]:
-                    suggestions.append(PermissionUpdate(**s))
+                suggestions = [
+                    PermissionUpdate(**s) if isinstance(s, dict) else s
+                    for s in self.pending_suggestions
+                ]
 
                 self.permission_result = PermissionResultAllow(
                     updated_permissions=suggestions
                 )
             else:
-                self.permission_result = PermissionResultAllow()
+                self.permission_result = _ALLOW
         else:
             self.permission_result = PermissionResultDeny(message="User denied")
 
         # Signal that response is ready
-        if self.permission_event:
-            self.permission_event.set()
+        self.permission_requested.clear()
+        self.permission_event.set()
+
+    async def wait_for_permission(self, timeout: float) -> Optional[dict[str, Any]]:
+        """
+        Wait for a permission request that still needs a response.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            The pending permission request, or None if none arrived in time
+        """
+        try:
+            async with asyncio.timeout(timeout):
+                await self.permission_requested.wait()
+        except asyncio.TimeoutError:
+            return None
+        return self.pending_permission
 
     async def send_message(self, message: str) -> SendMessageResponse:
         """
         Send a message and get the response.
 
+        Collects the events of send_message_stream into a single reply.
+
         Args:
             message: The user's message
 
@@ -364,39 +510,28 @@ class AgentSession:
         Raises:
             HTTPException: If session not connected
         """
-        if not self.client or self.status != "connected":
-            raise HTTPException(status_code=400, detail="Session not connected")
-
-        self.last_activity = datetime.now(timezone.utc)
-        self.message_count += 1
-
-        # Send message
-        await self.client.query(message)
-
-        # Collect response
         messages = []
         cost_usd = None
         num_turns = None
 
-        async for msg in self.client.receive_response():
-            if isinstance(msg, UserMessage):
-                # Skip user messages in response
-                pass
-            elif isinstance(msg, AssistantMessage):
-                for block in msg.content:
-                    if isinstance(block, TextBlock):
-                        messages.append(MessageBlock(type="text", content=block.text))
-                    elif isinstance(block, ToolUseBlock):
-                        messages.append(
-                            MessageBlock(
-                                type="tool_use",
-                                tool_name=block.name,
-                                tool_input=block.input,
-                            )
+        # Closed on the way out, even if this request is cancelled, so the
+        # query lock doesn't stay held until the generator is collected
+        async with aclosing(self.send_message_stream(message)) as events:
+            async for event in events:
+                event_type = event["type"]
+                if event_type == "text":
+                    messages.append(MessageBlock(type="text", content=event["content"]))
+                elif event_type == "tool_use":
+                    messages.append(
+                        MessageBlock(
+                            type="tool_use",
+                            tool_name=event["tool_name"],
+                            tool_input=event["tool_input"],
                         )
-            elif isinstance(msg, ResultMessage):
-                cost_usd = msg.total_cost_usd
-                num_turns = msg.num_turns
+                    )
+                elif event_type == "result":
+                    cost_usd = event["cost_usd"]
+                    num_turns = event["num_turns"]
 
         return SendMessageResponse(
             messages=messages,
@@ -421,74 +556,80 @@ class AgentSession:
         if not self.client or self.status != "connected":
             raise HTTPException(status_code=400, detail="Session not connected")
 
-        self.last_activity = datetime.now(timezone.utc)
-        self.message_count += 1
+        # One turn at a time: concurrent queries on the same SDK client would
+        # consume each other's responses
+        async with self._query_lock:
+            self.last_activity_monotonic = time.monotonic()
+            self._turn_progress += 1
+            self.message_count += 1
+
+            # Send initial event
+            yield {
+                "type": "start",
+                "session_id": self.session_id,
+                "message": message
+            }
 
-        # Send initial event
-        yield {
-            "type": "start",
-            "session_id": self.session_id,
-            "message": message
-        }
+            # Send message
+            await self.client.query(message)
 
-        # Send message
-        await self.client.query(message)
+            # Track last reported permission to avoid duplicates
+            last_permission_id = None
 
-        # Track last reported permission to avoid duplicates
-        last_permission_id = None
+            # Stream response
+            async for msg in self.client.receive_response():
+                self.last_activity_monotonic = time.monotonic()
+                self._turn_progress += 1
+                # Check for pending permission and send event if new
+                if self.pending_permission:
+                    current_permission_id = self.pending_permission.get("request_id")
+                    if current_permission_id != last_permission_id:
+                        yield {
+                            "type": "permission",
+                            "permission": self.pending_permission
+                        }
+                        last_permission_id = current_permission_id
 
-        # Stream response
-        async for msg in self.client.receive_response():
-            # Check for pending permission and send event if new
-            if self.pending_permission:
-                current_permission_id = self.pending_permission.get("request_id")
-                if current_permission_id != last_permission_id:
+                if isinstance(msg, UserMessage):
+                    # User message event
                     yield {
-                        "type": "permission",
-                        "permission": self.pending_permission
+                        "type": "user_message",
+                        "content": msg.content
                     }
-                    last_permission_id = current_permission_id
-
-            if isinstance(msg, UserMessage):
-                # User message event
-                yield {
-                    "type": "user_message",
-                    "content": msg.content
-                }
-            elif isinstance(msg, AssistantMessage):
-                # Assistant message with content blocks
-                for block in msg.content:
-                    if isinstance(block, TextBlock):
-                        yield {
-                            "type": "text",
-                            "content": block.text
-                        }
-                    elif isinstance(block, ToolUseBlock):
-                        yield {
-                            "type": "tool_use",
-                            "tool_name": block.name,
-                            "tool_input": block.input,
-                            "tool_use_id": block.id
-                        }
-            elif isinstance(msg, ResultMessage):
-                # Final result with metadata
-                yield {
-                    "type": "result",
-                    "cost_usd": msg.total_cost_usd,
-                    "num_turns": msg.num_turns,
-                    "session_id": self.session_id
-                }
-
-        # Send completion event
-        yield {
-            "type": "done",
-            "session_id": self.session_id
-        }
+                elif isinstance(msg, AssistantMessage):
+                    # Assistant message with content blocks
+                    for block in msg.content:
+                        if isinstance(block, TextBlock):
+                            yield {
+                                "type": "text",
+                                "content": block.text
+                            }
+                        elif isinstance(block, ToolUseBlock):
+                            yield {
+                                "type": "tool_use",
+                                "tool_name": block.name,
+                                "tool_input": block.input,
+                                "tool_use_id": block.id
+                            }
+                elif isinstance(msg, ResultMessage):
+                    # Final result with metadata
+                    yield {
+                        "type": "result",
+                        "cost_usd": msg.total_cost_usd,
+                        "num_turns": msg.num_turns,
+                        "session_id": self.session_id
+                    }
+
+            # Send completion event
+            yield {
+                "type": "done",
+                "session_id": self.session_id
+            }
 
-        from .claude_sync_manager import get_claude_sync_manager
-        sync_manager = get_claude_sync_manager()
-        if sync_manager:
-            asyncio.create_task(sync_manager.backup_after_task(self.user_id))
+            from .claude_sync_manager import get_claude_sync_manager
+            sync_manager = get_claude_sync_manager()
+            if sync_manager:
+                asyncio.create_task(sync_manager.backup_after_task(self.user_id))
 
     async def set_model(self, model: Optional[str]):
         """
@@ -507,7 +648,7 @@ class AgentSession:
             await self.client.set_model(model)
             self.current_model = model
             self.model = model  # Update tracked model for consistency
-            self.last_activity = datetime.now(timezone.utc)
+            self.last_activity_monotonic = time.monotonic()
         except Exception as e:
             raise HTTPException(
                 status_code=500, detail=f"Failed to set model: {str(e)}"
@@ -525,7 +666,7 @@ class AgentSession:
 
         try:
             await self.client.interrupt()
-            self.last_activity = datetime.now(timezone.utc)
+            self.last_activity_monotonic = time.monotonic()
         except Exception as e:
             raise HTTPException(
                 status_code=500, detail=f"Failed to interrupt: {str(e)}"
@@ -546,7 +687,7 @@ class AgentSession:
 
         try:
             await self.client.set_permission_mode(mode)
-            self.last_activity = datetime.now(timezone.utc)
+            self.last_activity_monotonic = time.monotonic()
         except Exception as e:
             raise HTTPException(
                 status_code=500, detail=f"Failed to set permission mode: {str(e)}"
@@ -584,16 +725,80 @@ class AgentSession:
         """
         Get current session status.
 
+        The status is rebuilt only when the status, the pending permission or
+        the model changes. Each poll that sees no change and no agent
+        progress backs off the suggested retry_after_ms exponentially; one jittered
+        copy is kept per backoff step.
+
         Returns:
             SessionStatus object
-        """
-        pending_perm = None
-        if self.pending_permission:
-            pending_perm = PermissionRequest(**self.pending_permission)
 
-        return SessionStatus(
-            session_id=self.session_id,
-            status=self.status,
-            pending_permission=pending_perm,
-            current_model=self.current_model,
-        )
+        Raises:
+            HTTPException: 429 if clients keep polling before any suggested
+                delay has passed
+        """
+        now = time.monotonic()
+        hints = self._status_hints
+        # A poll that some outstanding hint allows uses that hint up
+        due = bool(hints) and hints[0] <= now
+        if due:
+            heapq.heappop(hints)
+
+        cache = self._status_cache
+        if (
+            cache is not None
+            and cache[0] == self.status
+            and cache[1] is self.pending_permission
+            and cache[2] == self.current_model
+            and self._status_polled_activity == self._turn_progress
+        ):
+            if due or not hints:
+                self._status_early_polls = 0
+            else:
+                self._status_early_polls += 1
+                if self._status_early_polls > STATUS_POLL_EARLY_LIMIT:
+                    raise HTTPException(
+                        status_code=429,
+                        detail="Polling faster than the suggested retry_after_ms",
+                        headers={"Retry-After": str(math.ceil(hints[0] - now))},
+                    )
+            self._status_polls += 1
+            steps = cache[3]
+        else:
+            pending_perm = None
+            if self.pending_permission:
+                pending_perm = PermissionRequest(**self.pending_permission)
+
+            steps = [None] * STATUS_POLL_STEPS
+            steps[0] = SessionStatus(
+                session_id=self.session_id,
+                status=self.status,
+                pending_permission=pending_perm,
+                current_model=self.current_model,
+                retry_after_ms=self._retry_after_ms(0),
+            )
+            self._status_cache = (
+                self.status, self.pending_permission, self.current_model, steps
+            )
+            self._status_polls = 0
+            self._status_early_polls = 0
+            self._status_polled_activity = self._turn_progress
+
+        step = min(self._status_polls, STATUS_POLL_STEPS - 1)
+        status = steps[step]
+        if status is None:
+            status = steps[step] = steps[0].model_copy(
+                update={"retry_after_ms": self._retry_after_ms(step)}
+            )
+        deadline = now + status.retry_after_ms / 1000
+        if len(hints) < STATUS_POLL_HINTS_MAX:
+            heapq.heappush(hints, deadline)
+        else:
+            heapq.heappushpop(hints, deadline)
+        return status
+
+    @staticmethod
+    def _retry_after_ms(step: int) -> int:
+        """Jittered poll delay for a backoff step."""
+        base = STATUS_POLL_BASE_MS << step
+        return base + random.randint(0, base // 2)
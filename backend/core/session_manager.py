@@ -6,7 +6,13 @@ concurrent Claude Agent sessions, handling creation, restoration,
 and cleanup operations.
 """
 
+import asyncio
 import json
+import os
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Optional
@@ -16,6 +22,27 @@ from fastapi import HTTPException
 from ..models import SessionInfo
 from .session import AgentSession
 
+try:
+    import orjson  # optional, faster parsing of session files
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Claude's compact JSONL session files put an entry's "type" key ahead of any
+# nested object, so most lines' entry type can be read from the raw bytes
+# without parsing them (see SessionManager._entry_type)
+_TYPE_KEY = b'"type":'
+_TYPE_VALUE_OFFSET = len(_TYPE_KEY)
+_USER_TYPE = b'"user"'
+_ASSISTANT_TYPE = b'"assistant"'
+_SUMMARY_TYPE = b'"summary"'
+
+# Number of scanned session files whose preview info is kept in memory
+PREVIEW_CACHE_SIZE = 4096
+
+# Worker threads used to scan session files in parallel
+SCAN_WORKERS = min(os.cpu_count() or 4, 8)
+
 
 class SessionManager:
     """
@@ -23,14 +50,106 @@ class SessionManager:
 
     Each session maintains its own SDK client, conversation history,
     and permission state. Supports session creation, restoration,
-    and cleanup.
+    and cleanup. Idle sessions are closed after a timeout, and the least
+    recently used session is evicted when the session limit is reached.
     """
 
-    def __init__(self):
-        """Initialize the session manager."""
-        self.sessions: dict[str, AgentSession] = {}
+    def __init__(self, session_timeout_minutes: int = 60, max_sessions: int = 100):
+        """
+        Initialize the session manager.
+
+        Args:
+            session_timeout_minutes: Idle time after which a session is closed
+            max_sessions: Maximum number of concurrently active sessions
+        """
+        # Active sessions, least recently used first
+        self.sessions: OrderedDict[str, AgentSession] = OrderedDict()
+        self.session_timeout_minutes = session_timeout_minutes
+        self.max_sessions = max_sessions
+        self._cleanup_task: Optional[asyncio.Task] = None
+        self._running = False
+        # Session ID -> task disconnecting a session closed in the background
+        self._closing: dict[str, asyncio.Task] = {}
         self.session_dir = Path.home() / ".claude" / "projects"
 
+        # Session file path -> (mtime_ns, size, scan result), in LRU order
+        self._preview_cache: OrderedDict[
+            str, tuple[int, int, tuple[Optional[str], Optional[str], int]]
+        ] = OrderedDict()
+        # Project directory -> st_mtime_ns when it was found to hold no
+        # user-visible sessions; its contents can't change without the mtime
+        self._empty_project_dirs: dict[str, int] = {}
+        self._scan_pool = ThreadPoolExecutor(
+            max_workers=SCAN_WORKERS, thread_name_prefix="session-scan"
+        )
+
+    async def start(self):
+        """Start the background task that closes idle sessions."""
+        if self._running:
+            return
+        self._running = True
+        self._cleanup_task = asyncio.create_task(self._cleanup_loop())
+
+    async def stop(self):
+        """Stop background tasks and release the session file scan workers."""
+        self._running = False
+        if self._cleanup_task:
+            self._cleanup_task.cancel()
+            try:
+                await self._cleanup_task
+            except asyncio.CancelledError:
+                pass
+        await asyncio.gather(*self._closing.values(), return_exceptions=True)
+        self._scan_pool.shutdown(wait=False, cancel_futures=True)
+
+    async def _cleanup_loop(self):
+        while self._running:
+            try:
+                await self._cleanup_inactive_sessions()
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                break
+            except Exception:
+                await asyncio.sleep(60)
+
+    async def _cleanup_inactive_sessions(self):
+        timeout_threshold = time.monotonic() - self.session_timeout_minutes * 60
+        sessions_to_remove = [
+            session_id
+            for session_id, session in self.sessions.items()
+            if session.last_activity_monotonic < timeout_threshold
+            and not session.is_busy
+        ]
+
+        await asyncio.gather(
+            *(self.close_session(session_id) for session_id in sessions_to_remove),
+            return_exceptions=True,
+        )
+
+    async def _evict_least_recently_used(self):
+        """
+        Close the least recently used session to make room for a new one.
+
+        Sessions with a query in progress or waiting on a permission
+        decision are never evicted.
+
+        Raises:
+            HTTPException: If every active session is busy
+        """
+        # Pick the victim before awaiting so the dict is never iterated
+        # across a suspension point
+        victim = next(
+            (
+                session_id
+                for session_id, session in self.sessions.items()
+                if not session.is_busy
+            ),
+            None,
+        )
+        if victim is None:
+            raise HTTPException(status_code=503, detail="Too many active sessions")
+        await self.close_session(victim)
+
     async def create_session(
         self,
         user_id: Optional[str] = None,
@@ -56,11 +175,19 @@ class SessionManager:
         Returns:
             The session ID (new or resumed)
         """
-        session_id = resume_session_id or str(__import__("uuid").uuid4())
+        session_id = resume_session_id or str(uuid.uuid4())
+
+        # Let a background close of the same session finish before resuming it
+        closing = self._closing.get(session_id)
+        if closing:
+            await asyncio.gather(closing, return_exceptions=True)
 
         if session_id in self.sessions:
             raise HTTPException(status_code=400, detail="Session already active")
 
+        if len(self.sessions) >= self.max_sessions:
+            await self._evict_least_recently_used()
+
         session = AgentSession(
             session_id,
             user_id,
@@ -89,7 +216,7 @@ class SessionManager:
 
     def get_session(self, session_id: str) -> AgentSession:
         """
-        Get an active session by ID.
+        Get an active session by ID, marking it as recently used.
 
         Args:
             session_id: The session ID
@@ -100,9 +227,13 @@ class SessionManager:
         Raises:
             HTTPException: If session not found
         """
-        if session_id not in self.sessions:
+        if (session := self.sessions.get(session_id)) is None:
             raise HTTPException(status_code=404, detail="Session not found")
-        return self.sessions[session_id]
+        # Any request on the session keeps it alive, so eviction order and
+        # the idle timeout agree
+        self.sessions.move_to_end(session_id)
+        session.last_activity_monotonic = time.monotonic()
+        return session
 
     async def close_session(self, session_id: str):
         """
@@ -111,10 +242,42 @@ class SessionManager:
         Args:
             session_id: The session ID to close
         """
-        if session_id in self.sessions:
-            session = self.sessions[session_id]
+        session = self.sessions.pop(session_id, None)
+        if session:
             await session.disconnect()
-            del self.sessions[session_id]
+
+    def close_session_in_background(self, session_id: str) -> bool:
+        """
+        Remove a session and disconnect it without waiting for the SDK.
+
+        The session disappears from the active list immediately; its client
+        is disconnected by a background task.
+
+        Args:
+            session_id: The session ID to close
+
+        Returns:
+            True if the session was active
+        """
+        session = self.sessions.pop(session_id, None)
+        if not session:
+            return False
+
+        task = asyncio.create_task(self._disconnect_session(session))
+        self._closing[session_id] = task
+        task.add_done_callback(
+            lambda t: self._closing.pop(session_id, None)
+            if self._closing.get(session_id) is t
+            else None
+        )
+        return True
+
+    @staticmethod
+    async def _disconnect_session(session: AgentSession):
+        try:
+            await session.disconnect()
+        except Exception as e:
+            print(f"⚠️  Failed to disconnect session {session.session_id}: {e}")
 
     def list_sessions(self, cwd: Optional[str] = None) -> list[SessionInfo]:
         """
@@ -126,123 +289,272 @@ class SessionManager:
         Returns:
             List of SessionInfo objects
         """
-        result = []
-        for session_id, session in self.sessions.items():
+        return [
+            SessionInfo.model_construct(
+                session_id=session_id,
+                created_at=session.created_at_iso,
+                last_activity=session.last_activity.isoformat(),
+                status=session.status,
+                message_count=session.message_count,
+                cwd=session.cwd,
+            )
+            for session_id, session in self.sessions.items()
             # Filter by cwd if provided
-            if cwd and session.cwd != cwd:
-                continue
+            if not cwd or session.cwd == cwd
+        ]
 
-            result.append(
-                SessionInfo(
-                    session_id=session_id,
-                    created_at=session.created_at.isoformat(),
-                    last_activity=session.last_activity.isoformat(),
-                    status=session.status,
-                    message_count=session.message_count,
-                    cwd=session.cwd,
-                )
-            )
-        return result
+    def _get_cached_preview(
+        self, session_file: str, stat: os.stat_result
+    ) -> Optional[tuple[Optional[str], Optional[str], int]]:
+        """
+        Get a session file's cached scan result if the file is unchanged.
+
+        Args:
+            session_file: Path to the session's JSONL file
+            stat: The file's current stat result
+
+        Returns:
+            Same as _scan_session_file, or None if not cached or stale
+        """
+        cached = self._preview_cache.get(session_file)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            self._preview_cache.move_to_end(session_file)
+            return cached[2]
+        return None
+
+    def _cache_preview(
+        self,
+        session_file: str,
+        stat: os.stat_result,
+        result: tuple[Optional[str], Optional[str], int],
+    ):
+        """Cache a session file's scan result, evicting the oldest entry."""
+        self._preview_cache[session_file] = (stat.st_mtime_ns, stat.st_size, result)
+        self._preview_cache.move_to_end(session_file)
+        if len(self._preview_cache) > PREVIEW_CACHE_SIZE:
+            self._preview_cache.popitem(last=False)
+
+    @staticmethod
+    def _entry_type(line: bytes) -> Optional[str]:
+        """
+        Read a JSONL line's top-level entry type without parsing it.
 
-    def list_available_sessions(
+        Args:
+            line: Raw line from a session file
+
+        Returns:
+            "user", "assistant" or "summary", "" for any other type, or None
+            if the line has to be parsed to tell
+        """
+        idx = line.find(_TYPE_KEY)
+        if idx < 0 or not line.rstrip().endswith(b"}"):
+            return None
+        # A "{" or "[" ahead of the key may open a nested object holding it
+        if line.find(b"{", 1, idx) >= 0 or line.find(b"[", 1, idx) >= 0:
+            return None
+        value = idx + _TYPE_VALUE_OFFSET
+        if line.startswith(_USER_TYPE, value):
+            return "user"
+        if line.startswith(_ASSISTANT_TYPE, value):
+            return "assistant"
+        if line.startswith(_SUMMARY_TYPE, value):
+            return "summary"
+        if line.startswith(b'"', value):
+            return ""
+        return None
+
+    @staticmethod
+    def _scan_session_file(
+        session_file: str,
+    ) -> tuple[Optional[str], Optional[str], int]:
+        """
+        Scan a JSONL session file for its preview information.
+
+        Lines are classified from their raw bytes where the entry type is
+        unambiguous; other lines, the summary and the first user message are
+        parsed.
+
+        Args:
+            session_file: Path to the session's JSONL file
+
+        Returns:
+            Tuple of (summary, first user message, user/assistant message count)
+        """
+        summary = None
+        first_user_message = None
+        message_count = 0
+
+        with open(session_file, "rb") as f:
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+            for line in f:
+                entry = None
+                entry_type = SessionManager._entry_type(line)
+                if entry_type is None:
+                    try:
+                        entry = _json_loads(line)
+                    except json.JSONDecodeError:  # orjson's error subclasses it
+                        continue
+                    if not isinstance(entry, dict):
+                        continue
+                    entry_type = entry.get("type")
+
+                if entry_type in ("user", "assistant"):
+                    # Count actual user/assistant messages
+                    message_count += 1
+                    if entry_type == "assistant" or first_user_message:
+                        continue
+                elif entry_type != "summary" or summary:
+                    continue
+
+                if entry is None:
+                    try:
+                        entry = _json_loads(line)
+                    except json.JSONDecodeError:
+                        continue
+
+                # Get first user message for preview
+                if entry_type == "user" and not first_user_message:
+                    msg = entry.get("message", {})
+                    content = msg.get("content", "")
+                    if isinstance(content, str):
+                        first_user_message = content
+                    elif isinstance(content, list) and len(content) > 0:
+                        # Extract text from first content block
+                        first_block = content[0]
+                        if isinstance(first_block, dict):
+                            first_user_message = first_block.get("text", "")
+                        elif isinstance(first_block, str):
+                            first_user_message = first_block
+
+                # Check for summary
+                if entry_type == "summary" and not summary:
+                    summary = entry.get("summary", "")
+
+        return summary, first_user_message, message_count
+
+    def _list_session_files(
         self, cwd: Optional[str] = None
-    ) -> list[dict[str, Any]]:
+    ) -> list[tuple[str, str, str, os.stat_result]]:
         """
-        List all available sessions from disk, optionally filtered by cwd.
+        Find session files on disk, optionally filtered by cwd.
 
         Args:
             cwd: Optional working directory to filter by
 
         Returns:
-            List of session information dictionaries
+            List of (session_id, project, path, stat) tuples
         """
-        sessions = []
-
-        if not self.session_dir.exists():
-            return sessions
+        files = []
 
         # If cwd is provided, only scan that specific project directory
         if cwd:
             path_key = cwd.replace("/", "-").replace("_", "-")
-            project_dirs = [self.session_dir / path_key]
+            project_dirs = [str(self.session_dir / path_key)]
         else:
             # Scan all project directories
-            project_dirs = list(self.session_dir.iterdir())
+            try:
+                with os.scandir(self.session_dir) as it:
+                    project_dirs = [entry.path for entry in it if entry.is_dir()]
+            except OSError:
+                return files  # No session directory yet
 
         for project_dir in project_dirs:
-            if not project_dir.exists() or not project_dir.is_dir():
+            try:
+                dir_mtime = os.stat(project_dir).st_mtime_ns
+                if self._empty_project_dirs.get(project_dir) == dir_mtime:
+                    continue
+                with os.scandir(project_dir) as it:
+                    session_files = [
+                        entry
+                        for entry in it
+                        if entry.name.endswith(".jsonl")
+                        # Skip SDK internal sessions (agent-xxxxxxxx format)
+                        # These are created by Claude Agent SDK and not user-visible
+                        and not entry.name.startswith("agent-")
+                    ]
+            except OSError:
+                continue  # Missing or not a directory
+
+            if not session_files:
+                self._empty_project_dirs[project_dir] = dir_mtime
                 continue
+            self._empty_project_dirs.pop(project_dir, None)
 
-            for session_file in project_dir.glob("*.jsonl"):
+            project = os.path.basename(project_dir)
+            for session_file in session_files:
+                session_id = session_file.name[:-len(".jsonl")]
                 try:
-                    session_id = session_file.stem
+                    stat = session_file.stat()
+                except OSError:
+                    continue
+                files.append((session_id, project, session_file.path, stat))
 
-                    # Skip SDK internal sessions (agent-xxxxxxxx format)
-                    # These are created by Claude Agent SDK and not user-visible
-                    if session_id.startswith("agent-"):
-                        continue
+        return files
 
-                    mtime = session_file.stat().st_mtime
-                    modified = datetime.fromtimestamp(mtime, tz=timezone.utc)
-
-                    # Read file to check if it has actual content
-                    preview = "No preview"
-                    summary = None
-                    message_count = 0
-                    first_user_message = None
-
-                    with open(session_file, encoding="utf-8") as f:
-                        for line in f:
-                            line = line.strip()
-                            if not line:
-                                continue
-
-                            try:
-                                entry = json.loads(line)
-                                entry_type = entry.get("type")
-
-                                # Count actual user/assistant messages
-                                if entry_type in ["user", "assistant"]:
-                                    message_count += 1
-
-                                    # Get first user message for preview
-                                    if entry_type == "user" and not first_user_message:
-                                        msg = entry.get("message", {})
-                                        content = msg.get("content", "")
-                                        if isinstance(content, str):
-                                            first_user_message = content
-                                        elif isinstance(content, list) and len(content) > 0:
-                                            # Extract text from first content block
-                                            first_block = content[0]
-                                            if isinstance(first_block, dict):
-                                                first_user_message = first_block.get("text", "")
-                                            elif isinstance(first_block, str):
-                                                first_user_message = first_block
-
-                                # Check for summary
-                                if entry_type == "summary" and not summary:
-                                    summary = entry.get("summary", "")
-                            except json.JSONDecodeError:
-                                continue
-
-                    # Use summary if available, otherwise use first user message
-                    if summary:
-                        preview = summary[:100]
-                    elif first_user_message:
-                        preview = first_user_message[:100]
-
-                    sessions.append(
-                        {
-                            "session_id": session_id,
-                            "modified": modified.isoformat(),
-                            "preview": preview,
-                            "project": project_dir.name,
-                            "message_count": message_count,
-                            "first_message": first_user_message[:100] if first_user_message else None,
-                        }
-                    )
-                except Exception:
-                    continue
+    async def list_available_sessions(
+        self, cwd: Optional[str] = None
+    ) -> list[dict[str, Any]]:
+        """
+        List all available sessions from disk, optionally filtered by cwd.
+
+        Directory listing and file scanning run in worker threads so large
+        session directories don't block the event loop.
+
+        Args:
+            cwd: Optional working directory to filter by
+
+        Returns:
+            List of session information dictionaries
+        """
+        loop = asyncio.get_event_loop()
+        files = await loop.run_in_executor(None, self._list_session_files, cwd)
+
+        # Read file to check if it has actual content, skipping unchanged ones
+        previews = [
+            self._get_cached_preview(path, stat) for _, _, path, stat in files
+        ]
+        misses = [i for i, preview in enumerate(previews) if preview is None]
+        scanned = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    self._scan_pool, self._scan_session_file, files[i][2]
+                )
+                for i in misses
+            ),
+            return_exceptions=True,
+        )
+        for i, result in zip(misses, scanned):
+            if isinstance(result, Exception):
+                continue  # Unreadable file; leave it out
+            self._cache_preview(files[i][2], files[i][3], result)
+            previews[i] = result
+
+        sessions = []
+        for (session_id, project, _, stat), scan in zip(files, previews):
+            if scan is None:
+                continue
+            summary, first_user_message, message_count = scan
+            modified = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
+
+            # Use summary if available, otherwise use first user message
+            preview = "No preview"
+            if summary:
+                preview = summary[:100]
+            elif first_user_message:
+                preview = first_user_message[:100]
+
+            sessions.append(
+                {
+                    "session_id": session_id,
+                    "modified": modified.isoformat(),
+                    "preview": preview,
+                    "project": project,
+                    "message_count": message_count,
+                    "first_message": first_user_message[:100] if first_user_message else None,
+                }
+            )
 
         # Sort by modification time
         sessions.sort(key=lambda x: x["modified"], reverse=True)
@@ -166,8 +166,9 @@ class TerminalService(terminal_pb2_grpc.TerminalServicer):
                     )
                     seq = new_seq
 
-                # Small delay to avoid busy-waiting
-                await asyncio.sleep(0.05)
+                # Sleep until new output or exit; the timeout bounds how long
+                # a cancelled call goes unnoticed
+                await session.wait_for_output(seq, 1.0)
 
             # Send exit notification
             if session.exit_code is not None:
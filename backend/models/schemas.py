@@ -96,6 +96,7 @@ class SessionStatus(BaseModel):
     status: str
     pending_permission: Optional[PermissionRequest] = None
     current_model: Optional[str] = None
+    retry_after_ms: Optional[int] = None  # Suggested delay before polling again
 
 
 class SetModelRequest(BaseModel):
@@ -1,5 +1,5 @@
 """LiteLLM proxy integration."""
 
-from .litellm_proxy import remove_cache_control, router
+from .litellm_proxy import close_litellm_client, remove_cache_control, router
 
-__all__ = ["router", "remove_cache_control"]
+__all__ = ["router", "remove_cache_control", "close_litellm_client"]
@@ -5,20 +5,72 @@ Provides an Anthropic-compatible messages API endpoint that forwards
 requests to LiteLLM for multi-provider model inference support.
 """
 
+import asyncio
+import importlib.util
 import json
-from typing import Any
+import sys
+from contextlib import aclosing
+from typing import Any, Callable
 
+import httpx
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import StreamingResponse
 
+try:
+    import orjson  # optional, faster (de)serialization of requests and chunks
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+    _json_loads = json.loads
+
 router = APIRouter()
 
+# Keep proxies from buffering the SSE stream
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+# Largest request body the proxy accepts
+MAX_REQUEST_BYTES = 50_000_000
+
+# Stream events arriving within this window of the first buffered one are
+# sent together, up to the byte limit
+SSE_COALESCE_SECONDS = 0.005
+SSE_COALESCE_BYTES = 8192
+
+# Connection pool shared by all proxied LiteLLM calls
+LITELLM_POOL_LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=100)
+LITELLM_TIMEOUT = httpx.Timeout(600.0, connect=5.0)
+
+
+def _init_litellm(litellm) -> None:
+    """Configure LiteLLM once: callbacks and a pooled, keep-alive HTTP client."""
+    litellm.success_callback = ["langfuse"]
+    if litellm.aclient_session is not None:
+        return
+    litellm.aclient_session = httpx.AsyncClient(
+        limits=LITELLM_POOL_LIMITS,
+        timeout=LITELLM_TIMEOUT,
+        http2=importlib.util.find_spec("h2") is not None,
+    )
+
+
+async def close_litellm_client() -> None:
+    """Close the shared LiteLLM HTTP client, if one was created."""
+    litellm = sys.modules.get("litellm")
+    if litellm is None or litellm.aclient_session is None:
+        return
+    await litellm.aclient_session.aclose()
+    litellm.aclient_session = None
+
 
 def remove_cache_control(obj: Any) -> Any:
     """
     Recursively remove all cache_control fields from a data structure.
 
     This is needed for non-Claude models that don't support prompt caching.
+    Only the containers on the path to a removed field are copied; subtrees
+    without cache_control are returned as-is, so the input is never modified.
 
     Args:
         obj: The object to process (dict, list, or primitive)
@@ -27,18 +79,124 @@ def remove_cache_control(obj: Any) -> Any:
         The object with all cache_control fields removed
     """
     if isinstance(obj, dict):
-        # Create a new dict without cache_control
-        return {
-            k: remove_cache_control(v) for k, v in obj.items() if k != "cache_control"
-        }
+        new_obj = None
+        for k, v in obj.items():
+            if k == "cache_control":
+                if new_obj is None:
+                    new_obj = dict(obj)
+                del new_obj[k]
+                continue
+            new_v = remove_cache_control(v)
+            if new_v is not v:
+                if new_obj is None:
+                    new_obj = dict(obj)
+                new_obj[k] = new_v
+        return obj if new_obj is None else new_obj
     elif isinstance(obj, list):
-        # Process each item in the list
-        return [remove_cache_control(item) for item in obj]
+        new_list = None
+        for i, item in enumerate(obj):
+            new_item = remove_cache_control(item)
+            if new_item is not item:
+                if new_list is None:
+                    new_list = list(obj)
+                new_list[i] = new_item
+        return obj if new_list is None else new_list
     else:
         # Return primitives as-is
         return obj
 
 
+def _encode_model_chunk(chunk: Any) -> bytes:
+    # Pydantic model (serialized by pydantic-core)
+    return b"data: " + chunk.model_dump_json().encode() + b"\n\n"
+
+
+def _encode_json_method_chunk(chunk: Any) -> bytes:
+    # Dict-like with json method
+    return f"data: {chunk.json()}\n\n".encode()
+
+
+def _encode_plain_chunk(chunk: Any) -> bytes:
+    # Plain dict
+    return b"data: " + _json_dumps(chunk) + b"\n\n"
+
+
+def _sse_encoder(chunk: Any) -> Callable[[Any], bytes]:
+    """Pick the SSE event encoder for a LiteLLM stream chunk's type."""
+    if hasattr(chunk, "model_dump_json"):
+        return _encode_model_chunk
+    elif hasattr(chunk, "json"):
+        return _encode_json_method_chunk
+    else:
+        return _encode_plain_chunk
+
+
+async def _coalesce_sse_events(response):
+    """
+    Yield (data, event count) batches of SSE events from a LiteLLM stream.
+
+    A buffered event is held at most SSE_COALESCE_SECONDS waiting for more,
+    so fast-emitting providers cost fewer ASGI sends without delaying a lone
+    event. The upstream response is closed when the stream ends or the
+    client disconnects, releasing its pooled connection.
+    """
+    loop = asyncio.get_running_loop()
+    chunks = response.__aiter__()
+    # Chunk type -> encoder; a stream's chunks share one or two types, so the
+    # capability probes run once per type rather than once per chunk
+    encoders: dict[type, Callable[[Any], bytes]] = {}
+    buf = bytearray()
+    count = 0
+    deadline = 0.0
+    pending = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(anext(chunks))
+            if buf:
+                done, _ = await asyncio.wait({pending}, timeout=deadline - loop.time())
+                if not done:
+                    yield bytes(buf), count
+                    buf.clear()
+                    count = 0
+                    continue
+            try:
+                chunk = await pending
+            except StopAsyncIteration:
+                pending = None
+                break
+            except Exception:
+                # Send what was received before the upstream error
+                if buf:
+                    yield bytes(buf), count
+                raise
+            pending = None
+
+            if not buf:
+                deadline = loop.time() + SSE_COALESCE_SECONDS
+            encode = encoders.get(type(chunk))
+            if encode is None:
+                encode = encoders[type(chunk)] = _sse_encoder(chunk)
+            buf += encode(chunk)
+            count += 1
+            if len(buf) >= SSE_COALESCE_BYTES:
+                yield bytes(buf), count
+                buf.clear()
+                count = 0
+
+        if buf:
+            yield bytes(buf), count
+    finally:
+        if pending is not None and not pending.done():
+            pending.cancel()
+            try:
+                await pending
+            except BaseException:
+                pass
+        if hasattr(response, "aclose"):
+            await response.aclose()
+
+
 @router.post("/v1/messages")
 async def litellm_messages_proxy(request: Request):
     """
@@ -59,7 +217,7 @@ async def litellm_messages_proxy(request: Request):
         # Try to import litellm
         try:
             import litellm
-            litellm.success_callback = ["langfuse"]
+            _init_litellm(litellm)
             print("[LiteLLM Proxy] LiteLLM imported successfully")
         except ImportError:
             print("[LiteLLM Proxy] ERROR: LiteLLM not installed")
@@ -68,7 +226,15 @@ async def litellm_messages_proxy(request: Request):
                 detail="LiteLLM is not installed. Install with: pip install litellm",
             )
 
-        body = await request.json()
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > MAX_REQUEST_BYTES:
+            raise HTTPException(status_code=413, detail="Request body too large")
+
+        raw = await request.body()
+        if len(raw) > MAX_REQUEST_BYTES:
+            raise HTTPException(status_code=413, detail="Request body too large")
+        body = _json_loads(raw)
+        del raw  # Don't keep the raw body alive for the whole upstream call
 
         # Check if model is a Claude model
         model = body.get("model", "")
@@ -96,18 +262,10 @@ async def litellm_messages_proxy(request: Request):
                     print("[LiteLLM Proxy] Received response, streaming chunks...")
 
                     chunk_count = 0
-                    async for chunk in response:
-                        chunk_count += 1
-                        # Forward raw chunk in SSE format
-                        if hasattr(chunk, "model_dump_json"):
-                            # Pydantic model
-                            yield f"data: {chunk.model_dump_json()}\n\n"
-                        elif hasattr(chunk, "json"):
-                            # Dict-like with json method
-                            yield f"data: {chunk.json()}\n\n"
-                        else:
-                            # Plain dict
-                            yield f"data: {json.dumps(chunk)}\n\n"
+                    async with aclosing(_coalesce_sse_events(response)) as events:
+                        async for data, count in events:
+                            chunk_count += count
+                            yield data
 
                     print(f"[LiteLLM Proxy] Streaming completed, sent {chunk_count} chunks")
 
@@ -116,11 +274,12 @@ async def litellm_messages_proxy(request: Request):
                     error_data = {
                         "error": {"message": str(e), "type": type(e).__name__}
                     }
-                    yield f"data: {json.dumps(error_data)}\n\n"
+                    yield b"data: " + _json_dumps(error_data) + b"\n\n"
 
             return StreamingResponse(
                 generate_stream(),
                 media_type="text/event-stream",
+                headers=SSE_HEADERS,
             )
         else:
             # Non-streaming response
@@ -15,8 +15,12 @@ Key Features:
 - Graceful error handling
 """
 
+import asyncio
+import os
+import time
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
+from typing import Optional
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -34,16 +38,20 @@ from .api import (
     terminal_router,
     workspace_router,
 )
+from .api.agentcore import close_http_client as close_agentcore_client
 from .core import SessionManager
 from .core.pty_manager import PTYManager
 from .core.claude_sync_manager import initialize_claude_sync_manager, get_claude_sync_manager
-from .proxy import router as proxy_router
+from .proxy import close_litellm_client, router as proxy_router
 
 # ============================================================================
 # Global Session Manager
 # ============================================================================
 
-session_manager = SessionManager()
+session_manager = SessionManager(
+    session_timeout_minutes=int(os.environ.get("SESSION_IDLE_MINUTES", "60")),
+    max_sessions=int(os.environ.get("MAX_SESSIONS", "100")),
+)
 pty_manager = PTYManager()
 claude_sync_manager = None  # Will be initialized in lifespan
 
@@ -62,6 +70,7 @@ async def lifespan(app: FastAPI):
     print("=" * 80)
 
     await pty_manager.start()
+    await session_manager.start()
 
     # Initialize Claude sync manager and start backup task
     import os
@@ -93,11 +102,21 @@ async def lifespan(app: FastAPI):
 
     yield
 
-    # Shutdown - close all sessions
+    # Shutdown - close all sessions concurrently; one failing SDK disconnect
+    # must not keep the others open
     print("🛑 Shutting down server...")
-    for session_id in list(session_manager.sessions.keys()):
-        await session_manager.close_session(session_id)
+    await session_manager.stop()
+    session_ids = list(session_manager.sessions)
+    results = await asyncio.gather(
+        *(session_manager.close_session(sid) for sid in session_ids),
+        return_exceptions=True,
+    )
+    for sid, result in zip(session_ids, results):
+        if isinstance(result, Exception):
+            print(f"⚠️  Failed to close session {sid}: {result}")
     await pty_manager.stop()
+    await close_litellm_client()
+    await close_agentcore_client()
 
     # Stop Claude sync manager backup task
     if claude_sync_manager:
@@ -121,14 +140,30 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
-# Add CORS middleware to allow web client access
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Allow all origins for development
-    allow_credentials=True,
-    allow_methods=["*"],  # Allow all methods
-    allow_headers=["*"],  # Allow all headers
-)
+# Add CORS middleware to allow web client access. CORS_ORIGINS is a
+# comma-separated allowlist ("*", the default, allows any origin for
+# development); set it empty to skip the middleware for API-only deployments.
+cors_origins = [
+    origin.strip()
+    for origin in os.environ.get("CORS_ORIGINS", "*").split(",")
+    if origin.strip()
+]
+if cors_origins:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=cors_origins,
+        allow_credentials=True,
+        allow_methods=["GET", "POST", "DELETE"],
+        allow_headers=[
+            "Content-Type",
+            "Authorization",
+            "X-Amzn-Bedrock-AgentCore-Runtime-Session-Id",
+            "X-Amzn-Bedrock-AgentCore-Runtime-Workload-AccessToken",
+            "X-Amzn-Trace-Id",
+        ],
+        expose_headers=["X-Shell-Cwd"],
+        max_age=86400,  # Let browsers cache preflight results for a day
+    )
 
 # ============================================================================
 # Register Routers
@@ -175,26 +210,38 @@ app.include_router(proxy_router, tags=["proxy"])
 # Health Check
 # ============================================================================
 
+# How long a /health response is reused; load balancers probe far more often
+HEALTH_CACHE_SECONDS = 1.0
+
+# (time.monotonic() it was built at, response body) last served by /health
+_health_cache: tuple[float, Optional[dict]] = (0.0, None)
+
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint with GitHub auth status."""
+    global _health_cache
+    built_at, body = _health_cache
+    if body is not None and time.monotonic() - built_at < HEALTH_CACHE_SECONDS:
+        return body
+
     from backend.api.oauth import check_gh_auth_status
 
     gh_status = await check_gh_auth_status()
 
-    return {
+    body = {
         "status": "healthy",
         "active_sessions": len(session_manager.sessions),
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "github_auth": gh_status
     }
+    _health_cache = (time.monotonic(), body)
+    return body
 
 
 @app.get("/ping")
 async def ping():
     """Ping endpoint for health monitoring."""
-    import time
     return {
         "status": "Healthy",
         "time_of_last_update": int(time.time())
@@ -206,6 +253,23 @@ async def ping():
 # ============================================================================
 
 if __name__ == "__main__":
+    import importlib.util
+
     import uvicorn
 
-    uvicorn.run(app, host="127.0.0.1", port=8000, log_level="info")
+    # Prefer the uvloop event loop and httptools parser when installed. Sessions
+    # live in this process's memory, so the server runs as a single worker.
+    has_uvloop = importlib.util.find_spec("uvloop") is not None
+    has_httptools = importlib.util.find_spec("httptools") is not None
+
+    uvicorn.run(
+        "backend.server:app",
+        host="127.0.0.1",
+        port=8000,
+        loop="uvloop" if has_uvloop else "asyncio",
+        http="httptools" if has_httptools else "h11",
+        # Outlive the clients' 60s keep-alive pools so idle connections are
+        # reused rather than closed under them (uvicorn's default is 5s)
+        timeout_keep_alive=65,
+        log_level="info",
+    )
@@ -21,6 +21,12 @@ from typing import Optional
 
 import httpx
 
+try:
+    import h2  # noqa: F401 - optional, enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 
 class Colors:
     """ANSI color codes for terminal output."""
@@ -50,7 +56,12 @@ class APIClient:
             base_url: Base URL of the API server
         """
         self.base_url = base_url
-        self.client = httpx.AsyncClient(timeout=300.0)  # 5 minute timeout
+        self.client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            # 5 minutes for long agent turns, but fail fast when the server
+            # is unreachable
+            timeout=httpx.Timeout(300.0, connect=5.0),
+        )
 
     async def close(self):
         """Close the HTTP client."""
@@ -132,6 +143,27 @@ class APIClient:
         response.raise_for_status()
         return response.json()
 
+    async def wait_for_permission(
+        self, session_id: str, timeout: float = 30.0
+    ) -> Optional[dict]:
+        """
+        Long-poll for a pending permission request.
+
+        Args:
+            session_id: The session ID
+            timeout: Maximum seconds for the server to wait
+
+        Returns:
+            The pending permission request, or None if none arrived in time
+        """
+        response = await self.client.get(
+            f"{self.base_url}/sessions/{session_id}/permissions/wait",
+            params={"timeout": timeout},
+            timeout=timeout + 10.0,
+        )
+        response.raise_for_status()
+        return response.json().get("pending_permission")
+
     async def send_message(self, session_id: str, message: str) -> dict:
         """
         Send a message in a session.
@@ -417,8 +449,8 @@ class InteractiveClient:
         """
         Background task to check for pending permission requests.
 
-        This task polls the server for pending permissions and prompts
-        the user to approve or deny them.
+        This task long-polls the server, which answers as soon as a
+        permission is requested, and prompts the user to approve or deny it.
         """
         while True:
             try:
@@ -426,17 +458,13 @@ class InteractiveClient:
                     await asyncio.sleep(1)
                     continue
 
-                # Check session status
-                status = await self.api_client.get_session_status(
+                pending = await self.api_client.wait_for_permission(
                     self.current_session_id
                 )
 
-                pending = status.get("pending_permission")
                 if pending:
                     await self.handle_permission_request(pending)
 
-                await asyncio.sleep(0.5)  # Poll every 500ms
-
             except asyncio.CancelledError:
                 break
             except Exception:
@@ -603,14 +631,15 @@ class InteractiveClient:
 
                     if user_input.lower() == "clear":
                         print("\n🔄 Starting new session...\n")
-                        # Close old session
-                        await self.api_client.close_session(self.current_session_id)
-                        # Create new session
-                        session_info = await self.api_client.create_session(
-                            enable_proxy=self.enable_proxy,
-                            model=self.model,
-                            background_model=self.background_model,
-                            cwd=self.cwd,
+                        # Close old session and create new one concurrently
+                        _, session_info = await asyncio.gather(
+                            self.api_client.close_session(self.current_session_id),
+                            self.api_client.create_session(
+                                enable_proxy=self.enable_proxy,
+                                model=self.model,
+                                background_model=self.background_model,
+                                cwd=self.cwd,
+                            ),
                         )
                         self.current_session_id = session_info["session_id"]
                         print("✅ New session started\n")
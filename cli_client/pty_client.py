@@ -43,11 +43,12 @@ Examples:
 """
 
 import argparse
+import asyncio
+import base64
+import codecs
 import sys
 import os
-import time
-import threading
-import select
+import re
 import termios
 import tty
 import signal
@@ -55,10 +56,104 @@ import uuid
 import urllib.parse
 import json
 from typing import Optional
-from collections import deque
 
 import httpx
 
+try:
+    import h2  # noqa: F401 - optional, enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import orjson  # optional, faster JSON on the output and input paths
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+    _json_loads = json.loads
+
+# Blank line ending an SSE event; proxies may rewrite LF line endings as CRLF
+SSE_EVENT_END = re.compile(rb"\r?\n\r?\n")
+
+# Keystroke batching: flush once input has been quiet for the window, at most
+# the max delay after the first buffered byte, or as soon as the batch is large
+INPUT_BATCH_WINDOW = 0.008
+INPUT_BATCH_MAX_DELAY = 0.016
+INPUT_BATCH_MAX_BYTES = 16384
+
+# Poll mode: interval after output, doubled on each empty poll up to the max
+POLL_MIN_INTERVAL = 0.005
+POLL_MAX_INTERVAL = 0.25
+
+# Largest single read from stdin (large pastes arrive in few syscalls)
+STDIN_READ_SIZE = 65536
+
+# Input requests allowed in flight at once when the server applies them in
+# order; otherwise each batch waits for the previous one to be acknowledged
+MAX_INFLIGHT_INPUT = 8
+
+
+class SSEParser:
+    """
+    Incremental Server-Sent Events parser working on raw bytes.
+
+    Network reads can end anywhere, including in the middle of a ``data:``
+    line, so the unterminated tail is kept until the next ``feed``.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def feed(self, chunk: bytes) -> list[tuple[bytes, bytes]]:
+        """Add a chunk and return ``(event_type, data)`` for each complete event."""
+        self.buffer += chunk
+        events = []
+
+        start = 0
+        while True:
+            match = SSE_EVENT_END.search(self.buffer, start)
+            if not match:
+                break
+            end = match.start()
+
+            event_type = b"message"
+            data_lines = []
+            buf = self.buffer
+
+            # Walk the event's lines by index instead of splitting it
+            pos = start
+            while pos < end:
+                next_pos = buf.find(b"\n", pos, end)
+                if next_pos == -1:
+                    next_pos = end
+                line_end = next_pos
+                if line_end > pos and buf[line_end - 1] == 0x0D:  # CRLF
+                    line_end -= 1
+
+                if buf.startswith(b"data:", pos, line_end):
+                    value = pos + 5
+                    if buf.startswith(b" ", value, line_end):
+                        value += 1
+                    data_lines.append(buf[value:line_end])
+                elif buf.startswith(b"event:", pos, line_end):
+                    value = pos + 6
+                    if buf.startswith(b" ", value, line_end):
+                        value += 1
+                    event_type = bytes(buf[value:line_end])
+                # Anything else is a comment (e.g. keep-alive) or unused field
+
+                pos = next_pos + 1
+
+            if data_lines:
+                data = data_lines[0] if len(data_lines) == 1 else b"\n".join(data_lines)
+                events.append((event_type, bytes(data)))
+            start = match.end()
+
+        del self.buffer[:start]
+        return events
+
 
 class PTYClient:
     def __init__(
@@ -72,24 +167,56 @@ class PTYClient:
         self.output_seq = 0
         self.old_tty_settings = None
         self.use_streaming = True  # Try SSE streaming first
-
-        # Input buffering
-        self.input_buffer = deque()
-        self.input_lock = threading.Lock()
-
-        # Read environment variables
-        self.auth_token = os.environ.get('TOKEN')
-        self.session_id_header = os.environ.get('SESSION_ID') or str(uuid.uuid4())
-        self.workload_token = os.environ.get('WORKLOAD_IDENTITY_TOKEN')
+        self.binary_io = False  # Raw PTY bytes as base64, if the server supports it
+        self.ordered_input = False  # Server applies sequenced input in order
+        self.stream_read_timeout = 30.0  # Seconds without SSE bytes before reconnecting
+        self.max_stream_timeouts = 3  # Consecutive stalls before falling back to polling
+
+        # Set by whichever worker task exits first to wake up run()
+        self._done: Optional[asyncio.Event] = None
+
+        # Input buffering (filled by the stdin reader callback)
+        self.input_buffer = bytearray()
+        self._stdin_view = memoryview(bytearray(STDIN_READ_SIZE))  # reused by every read
+        self._stdout_fd = sys.stdout.fileno()
+        self._batch_started = 0.0
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_event: Optional[asyncio.Event] = None
+        self._input_sent: Optional[asyncio.Event] = None  # Wakes poll_output early
+
+        # Pipelined input requests (bounded by _input_slots)
+        self._input_seq = 0
+        self._input_slots: Optional[asyncio.Semaphore] = None
+        self._input_tasks: set[asyncio.Task] = set()
+        # Reused for the terminal bytes of each SSE read
+        self._output_buffer = bytearray()
+
+        # Holds back a multi-byte character split across batches (text mode)
+        self._input_decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+        # Set by SIGWINCH; the flush task reads the size once and sends it
+        self._resize_pending = False
+        self._last_size = None
+
+        # Read environment variables (once each)
+        env = os.environ
+        self.auth_token = env.get('TOKEN')
+        self.session_id_header = env.get('SESSION_ID') or str(uuid.uuid4())
+        self.workload_token = env.get('WORKLOAD_IDENTITY_TOKEN')
+        agentcore_url = env.get('AGENTCORE_URL')
+        agent_arn = env.get('AGENT_ARN')
+
+        # Headers only depend on the values above, so build them once
+        self._headers = self._build_headers()
+        self._stream_headers = self._build_headers(stream=True)
 
         # Determine base URL with priority: AGENTCORE_URL > AGENT_ARN > base_url arg > default
         # Convention: All URLs should be provided WITHOUT /invocations suffix
-        if os.environ.get('AGENTCORE_URL'):
-            self.base_url = os.environ.get('AGENTCORE_URL')
-        elif os.environ.get('AGENT_ARN'):
+        if agentcore_url:
+            self.base_url = agentcore_url
+        elif agent_arn:
             # Construct URL from AGENT_ARN (without /invocations suffix)
-            agent_arn = os.environ.get('AGENT_ARN')
-            region = os.environ.get('AWS_REGION', 'us-west-2')
+            region = env.get('AWS_REGION', 'us-west-2')
             encoded_arn = urllib.parse.quote(agent_arn, safe='')
             self.base_url = f"https://bedrock-agentcore.{region}.amazonaws.com/runtimes/{encoded_arn}"
         elif base_url:
@@ -100,10 +227,30 @@ class PTYClient:
         # Always append /invocations to base_url
         self.invocations_url = f"{self.base_url}/invocations"
 
-    def _get_headers(self):
-        """Get HTTP headers for requests."""
+        # Shared keep-alive client for every request, including SSE
+        # reconnects (which only override the timeout)
+        self._client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_keepalive_connections=8),
+            timeout=5.0
+        )
+
+    def _get_headers(self, stream: bool = False):
+        """Get HTTP headers for requests (built once, see _build_headers)."""
+        return self._stream_headers if stream else self._headers
+
+    def _build_headers(self, stream: bool = False):
+        """Build HTTP headers from the auth/session settings."""
         headers = {"Content-Type": "application/json"}
 
+        if stream:
+            # Ask proxies (nginx, AgentCore) not to buffer or compress SSE so
+            # each event reaches the terminal as soon as it is sent
+            headers["Accept"] = "text/event-stream"
+            headers["Cache-Control"] = "no-cache"
+            headers["X-Accel-Buffering"] = "no"
+            headers["Accept-Encoding"] = "identity"
+
         # Add auth token if available
         if self.auth_token:
             headers["Authorization"] = f"Bearer {self.auth_token}"
@@ -118,57 +265,93 @@ class PTYClient:
 
         return headers
 
-    def create_session(self) -> bool:
+    async def create_session(self) -> bool:
         try:
-            with httpx.Client() as client:
-                rows, cols = self._get_terminal_size()
-
-                response = client.post(
-                    self.invocations_url,
-                    headers=self._get_headers(),
-                    json={
-                        "path": "/terminal/sessions",
-                        "method": "POST",
-                        "payload": {
-                            "rows": rows,
-                            "cols": cols,
-                            "cwd": self.initial_cwd,
-                            "shell": "bash"
-                        }
-                    },
-                    timeout=10.0
-                )
+            rows, cols = self._get_terminal_size()
 
-                if response.status_code == 200:
-                    data = response.json()
-                    self.session_id = data.get("session_id")
-                    print(f"✓ Terminal session created: {self.session_id[:8]}...")
-                    return True
-                else:
-                    print(f"✗ Failed to create session: {response.status_code}")
-                    print(response.text)
-                    return False
+            response = await self._client.post(
+                self.invocations_url,
+                headers=self._get_headers(),
+                content=_json_dumps({
+                    "path": "/terminal/sessions",
+                    "method": "POST",
+                    "payload": {
+                        "rows": rows,
+                        "cols": cols,
+                        "cwd": self.initial_cwd,
+                        "shell": "bash"
+                    }
+                }),
+                timeout=10.0
+            )
+
+            if response.status_code == 200:
+                data = _json_loads(response.content)
+                self.session_id = data.get("session_id")
+                self._last_size = (rows, cols)
+                self.binary_io = "base64" in data.get("encodings", [])
+                self.ordered_input = data.get("ordered_input", False)
+                self._build_input_template()
+                print(f"✓ Terminal session created: {self.session_id[:8]}...")
+                return True
+            else:
+                print(f"✗ Failed to create session: {response.status_code}")
+                print(response.text)
+                return False
 
         except Exception as e:
             print(f"✗ Error creating session: {e}")
             return False
 
-    def close_session(self):
+    def _build_input_template(self):
+        """
+        Pre-serialize the input request body around its data field.
+
+        Path, method and session ID never change for the life of a session,
+        so keystroke flushes only need to encode the data (and sequence
+        number) themselves.
+        """
+        marker = "__PTY_INPUT__"
+        seq_marker = "__PTY_SEQ__"
+        field = "data_b64" if self.binary_io else "data"
+        payload = {field: marker}
+        if self.ordered_input:
+            payload["seq"] = seq_marker
+        body = _json_dumps({
+            "path": "/terminal/sessions/{session_id}/input",
+            "method": "POST",
+            "path_params": {"session_id": self.session_id},
+            "payload": payload
+        })
+        self._input_prefix, rest = body.split(_json_dumps(marker))
+        if self.ordered_input:
+            self._input_middle, self._input_suffix = rest.split(_json_dumps(seq_marker))
+        else:
+            self._input_middle, self._input_suffix = rest, None
+
+    def _input_body(self, data: bytes) -> bytes:
+        """Fill the input template with encoded data and the next sequence number."""
+        if self._input_suffix is None:
+            return self._input_prefix + data + self._input_middle
+
+        seq = self._input_seq
+        self._input_seq += 1
+        return self._input_prefix + data + self._input_middle + str(seq).encode() + self._input_suffix
+
+    async def close_session(self):
         if not self.session_id:
             return
 
         try:
-            with httpx.Client() as client:
-                client.post(
-                    self.invocations_url,
-                    headers=self._get_headers(),
-                    json={
-                        "path": "/terminal/sessions/{session_id}",
-                        "method": "DELETE",
-                        "path_params": {"session_id": self.session_id}
-                    },
-                    timeout=5.0
-                )
+            await self._client.post(
+                self.invocations_url,
+                headers=self._get_headers(),
+                content=_json_dumps({
+                    "path": "/terminal/sessions/{session_id}",
+                    "method": "DELETE",
+                    "path_params": {"session_id": self.session_id}
+                })
+            )
         except:
             pass
 
@@ -184,6 +367,10 @@ class PTYClient:
             return 24, 80
 
     def _setup_raw_mode(self):
+        # Terminal output goes to the raw fd; keep the occasional text-layer
+        # write (status messages) from lingering in Python's buffer behind it
+        sys.stdout.reconfigure(write_through=True)
+
         if not sys.stdin.isatty():
             return
 
@@ -194,195 +381,289 @@ class PTYClient:
         if self.old_tty_settings and sys.stdin.isatty():
             termios.tcsetattr(sys.stdin, termios.TCSADRAIN, self.old_tty_settings)
 
-    def _handle_resize(self, signum, frame):
+    def _handle_resize(self):
+        # Called from the event loop (add_signal_handler), not signal context:
+        # only flag the resize, so a burst of signals while dragging the
+        # window collapses into one size lookup and request
         if not self.session_id:
             return
 
+        self._resize_pending = True
+        self._flush_event.set()
+
+    async def _send_resize(self):
+        """Send the most recent pending terminal size, if any."""
+        if not self._resize_pending:
+            return
+
+        self._resize_pending = False
+        size = self._get_terminal_size()
+        if size == self._last_size:
+            return
+
+        self._last_size = size
+        rows, cols = size
         try:
-            rows, cols = self._get_terminal_size()
-            with httpx.Client() as client:
-                client.post(
-                    self.invocations_url,
-                    headers=self._get_headers(),
-                    json={
-                        "path": "/terminal/sessions/{session_id}/resize",
-                        "method": "POST",
-                        "path_params": {"session_id": self.session_id},
-                        "payload": {"rows": rows, "cols": cols}
-                    },
-                    timeout=2.0
-                )
+            await self._client.post(
+                self.invocations_url,
+                headers=self._get_headers(),
+                content=_json_dumps({
+                    "path": "/terminal/sessions/{session_id}/resize",
+                    "method": "POST",
+                    "path_params": {"session_id": self.session_id},
+                    "payload": {"rows": rows, "cols": cols}
+                }),
+                timeout=2.0
+            )
         except:
             pass
 
-    def stream_output(self):
+    def _output_payload(self) -> dict:
+        """Build the stream/poll payload for the current output position."""
+        payload = {"seq": self.output_seq}
+        if self.binary_io:
+            payload["encoding"] = "base64"
+        return payload
+
+    def _output_bytes(self, data: dict) -> bytes:
+        """Extract the raw terminal bytes from an output event or poll response."""
+        output_b64 = data.get("output_b64")
+        if output_b64:
+            return base64.b64decode(output_b64)
+        return data.get("output", "").encode("utf-8")
+
+    def _write_stdout(self, out: bytes):
+        """Write bytes to the terminal fd, bypassing the text-layer buffer."""
+        view = memoryview(out)
+        while view:
+            written = os.write(self._stdout_fd, view)
+            view = view[written:]
+
+    async def stream_output(self):
         """Stream output using SSE (Server-Sent Events)."""
-        try:
-            # Always use invocations endpoint for streaming
-            stream_url = self.invocations_url
-            headers = self._get_headers()
-
-            # Create streaming request
-            with httpx.Client(timeout=None) as client:
-                # POST with path in body for invocations endpoint
-                json_data = {
-                    "path": "/terminal/sessions/{session_id}/stream",
-                    "method": "GET",
-                    "path_params": {"session_id": self.session_id}
-                }
-                stream_context = client.stream("POST", stream_url, headers=headers, json=json_data)
-
-                # Fallback if invocations streaming not working
-                if False:
-                    # For direct mode, direct GET
-                    stream_context = client.stream("GET", stream_url, headers=headers)
-
-                with stream_context as response:
-                    if response.status_code != 200:
-                        print(f"✗ SSE connection failed: {response.status_code}", file=sys.stderr)
-                        print("→ Falling back to polling mode", file=sys.stderr)
-                        self.use_streaming = False
-                        self.poll_output()
-                        return
-
-                    # Process SSE events line by line
-                    buffer = ""
-                    for line in response.iter_lines():
-                        if not self.running:
-                            break
-
-                        line = line.strip()
-
-                        # SSE format: "data: {...}"
-                        if line.startswith("data: "):
-                            try:
-                                json_str = line[6:]  # Remove "data: " prefix
-                                data = json.loads(json_str)
-
-                                output = data.get("output", "")
-                                if output:
-                                    sys.stdout.write(output)
-                                    sys.stdout.flush()
-
-                                self.output_seq = data.get("seq", self.output_seq)
-
-                                exit_code = data.get("exit_code")
-                                if exit_code is not None:
-                                    self.running = False
-                                    break
-
-                            except json.JSONDecodeError:
-                                pass
-                            except Exception as e:
-                                if self.running:
-                                    print(f"\n✗ Stream error: {e}", file=sys.stderr)
-                                    break
+        timeouts = 0
+        while self.running:
+            seq_before = self.output_seq
+            try:
+                await self._stream_events()
+                return
+            except httpx.ReadTimeout:
+                # Nothing (not even a server heartbeat) arrived within the read
+                # timeout: an intermediate proxy is probably buffering the
+                # stream. Reconnect and resume from the last seen sequence.
+                if self.output_seq != seq_before:
+                    timeouts = 0
+                timeouts += 1
+                if timeouts >= self.max_stream_timeouts:
+                    print("\r\n✗ SSE stream stalled repeatedly", file=sys.stderr)
+                    print("→ Falling back to polling mode", file=sys.stderr)
+                    self.use_streaming = False
+                    await self.poll_output()
+                    return
+            except Exception as e:
+                print(f"\n✗ Streaming failed: {e}", file=sys.stderr)
+                print("→ Falling back to polling mode", file=sys.stderr)
+                self.use_streaming = False
+                await self.poll_output()
+                return
+
+    async def _stream_events(self):
+        """Open one SSE connection and write events until it ends."""
+        # Always use invocations endpoint for streaming
+        stream_url = self.invocations_url
+        headers = self._get_headers(stream=True)
+
+        # Bound the read timeout so a silently stalled stream is detected
+        timeout = httpx.Timeout(10.0, read=self.stream_read_timeout)
+
+        # POST with path in body for invocations endpoint
+        json_data = {
+            "path": "/terminal/sessions/{session_id}/stream",
+            "method": "GET",
+            "path_params": {"session_id": self.session_id},
+            "payload": self._output_payload()
+        }
+        async with self._client.stream(
+            "POST", stream_url, headers=headers, content=_json_dumps(json_data), timeout=timeout
+        ) as response:
+            if response.status_code != 200:
+                print(f"✗ SSE connection failed: {response.status_code}", file=sys.stderr)
+                print("→ Falling back to polling mode", file=sys.stderr)
+                self.use_streaming = False
+                await self.poll_output()
+                return
+
+            # Events that arrive in the same network read are written
+            # to the terminal together with a single os.write. No
+            # chunk_size here: httpx would hold data back to fill it.
+            parser = SSEParser()
+            async for chunk in response.aiter_bytes():
+                if not self.running:
+                    break
 
-        except Exception as e:
-            print(f"\n✗ Streaming failed: {e}", file=sys.stderr)
-            print("→ Falling back to polling mode", file=sys.stderr)
-            self.use_streaming = False
-            self.poll_output()
+                out = self._output_buffer
+                exited = False
+
+                for event_type, payload in parser.feed(chunk):
+                    if event_type != b"message":
+                        continue
+                    try:
+                        data = _json_loads(payload)
+                    except json.JSONDecodeError:
+                        continue
+
+                    out += self._output_bytes(data)
+                    self.output_seq = data.get("seq", self.output_seq)
+
+                    if data.get("exit_code") is not None:
+                        exited = True
+                        break
 
-    def poll_output(self):
-        """Poll output using HTTP requests (fallback mode)."""
-        client = httpx.Client(timeout=5.0)
-        try:
-            while self.running:
                 try:
-                    response = client.post(
-                        self.invocations_url,
-                        headers=self._get_headers(),
-                        json={
-                            "path": "/terminal/sessions/{session_id}/output",
-                            "method": "GET",
-                            "path_params": {"session_id": self.session_id},
-                            "payload": {"seq": self.output_seq}
-                        }
-                    )
-
-                    if response.status_code == 200:
-                        data = response.json()
-                        output = data.get("output", "")
-                        if output:
-                            sys.stdout.write(output)
-                            sys.stdout.flush()
-
-                        self.output_seq = data.get("seq", self.output_seq)
-
-                        exit_code = data.get("exit_code")
-                        if exit_code is not None:
-                            self.running = False
-                            break
-
-                    time.sleep(0.05)
-
-                except Exception:
+                    self._write_stdout(out)
+                except OSError as e:
                     if self.running:
-                        time.sleep(0.1)
-        finally:
-            client.close()
+                        print(f"\n✗ Stream error: {e}", file=sys.stderr)
+                    break
+                finally:
+                    out.clear()
 
-    def send_input(self):
-        """Read input from stdin and add to buffer."""
-        try:
-            while self.running:
+                if exited:
+                    self.running = False
+                    break
+
+    async def poll_output(self):
+        """Poll output using HTTP requests (fallback mode)."""
+        interval = POLL_MIN_INTERVAL
+        while self.running:
+            try:
+                response = await self._client.post(
+                    self.invocations_url,
+                    headers=self._get_headers(),
+                    content=_json_dumps({
+                        "path": "/terminal/sessions/{session_id}/output",
+                        "method": "GET",
+                        "path_params": {"session_id": self.session_id},
+                        "payload": self._output_payload()
+                    })
+                )
+
+                if response.status_code == 200:
+                    data = _json_loads(response.content)
+                    output = self._output_bytes(data)
+                    self._write_stdout(output)
+
+                    self.output_seq = data.get("seq", self.output_seq)
+
+                    exit_code = data.get("exit_code")
+                    if exit_code is not None:
+                        self.running = False
+                        break
+
+                    # Poll quickly while output flows, back off when idle
+                    if output:
+                        interval = POLL_MIN_INTERVAL
+                    else:
+                        interval = min(interval * 2, POLL_MAX_INTERVAL)
+
+                # Sent input usually produces output (at least the echo), so
+                # it cuts the wait short and resets the backoff
                 try:
-                    if sys.stdin.isatty():
-                        readable, _, _ = select.select([sys.stdin], [], [], 0.1)
-                        if readable:
-                            data = os.read(sys.stdin.fileno(), 1024)
-                            if data:
-                                # Add to buffer instead of sending immediately
-                                with self.input_lock:
-                                    self.input_buffer.append(data)
+                    await asyncio.wait_for(self._input_sent.wait(), interval)
+                    interval = POLL_MIN_INTERVAL
+                except asyncio.TimeoutError:
+                    pass
+                self._input_sent.clear()
+
+            except Exception:
+                if self.running:
+                    await asyncio.sleep(0.1)
+
+    def _read_stdin(self):
+        """Event loop reader callback: buffer stdin and schedule a flush."""
+        try:
+            # Read straight into the preallocated buffer; no bytes per read
+            n = os.readv(sys.stdin.fileno(), [self._stdin_view])
+        except OSError:
+            return
+
+        if not n:
+            return
+
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        if not self.input_buffer:
+            self._batch_started = now
+        start = len(self.input_buffer)
+        self.input_buffer += self._stdin_view[:n]
+
+        if len(self.input_buffer) >= INPUT_BATCH_MAX_BYTES or self.input_buffer.find(b"\x03", start) != -1:
+            # Large pastes and Ctrl-C go out immediately
+            deadline = now
+        else:
+            # Extend the window while bytes keep arriving, up to the max delay
+            deadline = min(now + INPUT_BATCH_WINDOW, self._batch_started + INPUT_BATCH_MAX_DELAY)
+
+        if self._flush_handle:
+            self._flush_handle.cancel()
+        self._flush_handle = loop.call_at(deadline, self._flush_event.set)
+
+    async def flush_input(self):
+        """Send buffered input to the server whenever a batch is due."""
+        while self.running:
+            await self._flush_event.wait()
+            self._flush_event.clear()
+
+            try:
+                # Take the whole pending batch
+                batch = bytes(self.input_buffer)
+                self.input_buffer.clear()
+
+                if batch and not self.binary_io:
+                    # An incomplete trailing character waits for the next batch
+                    batch = self._input_decoder.decode(batch)
+
+                # Send batch if not empty, without waiting for earlier batches
+                # to be acknowledged (up to the in-flight limit)
+                if batch:
+                    if self.binary_io:
+                        data = b'"' + base64.b64encode(batch) + b'"'
                     else:
-                        time.sleep(0.1)
+                        data = _json_dumps(batch)
+                    await self._input_slots.acquire()
+                    task = asyncio.create_task(self._post_input(self._input_body(data)))
+                    self._input_tasks.add(task)
+                    task.add_done_callback(self._input_tasks.discard)
 
-                except Exception:
-                    if self.running:
-                        time.sleep(0.1)
-        except Exception:
+                await self._send_resize()
+
+            except Exception:
+                if self.running:
+                    await asyncio.sleep(0.1)
+
+    async def _post_input(self, body: bytes):
+        """Send one input request and free its in-flight slot."""
+        try:
+            await self._client.post(
+                self.invocations_url,
+                headers=self._get_headers(),
+                content=body,
+                timeout=2.0
+            )
+            self._input_sent.set()
+        except:
             pass
+        finally:
+            self._input_slots.release()
 
-    def flush_input(self):
-        """Flush buffered input to server in batches."""
-        client = httpx.Client(timeout=2.0)
+    async def _worker(self, coro):
+        """Run a worker coroutine and signal shutdown when it returns."""
         try:
-            while self.running:
-                try:
-                    # Collect buffered input
-                    batch = b""
-                    with self.input_lock:
-                        while self.input_buffer:
-                            batch += self.input_buffer.popleft()
-
-                    # Send batch if not empty
-                    if batch:
-                        try:
-                            client.post(
-                                self.invocations_url,
-                                headers=self._get_headers(),
-                                json={
-                                    "path": "/terminal/sessions/{session_id}/input",
-                                    "method": "POST",
-                                    "path_params": {"session_id": self.session_id},
-                                    "payload": {"data": batch.decode('utf-8', errors='replace')}
-                                }
-                            )
-                        except:
-                            pass
-
-                    # Small delay to allow input accumulation (10ms)
-                    time.sleep(0.01)
-
-                except Exception:
-                    if self.running:
-                        time.sleep(0.1)
+            await coro
         finally:
-            client.close()
+            self._done.set()
 
-    def run(self):
+    async def run(self):
         print("PTY Terminal Client")
         print(f"Endpoint: {self.invocations_url}")
         if self.session_id_header:
@@ -394,41 +675,58 @@ class PTYClient:
         print(f"Output mode: {mode}")
         print()
 
-        if not self.create_session():
+        if not await self.create_session():
+            await self._client.aclose()
             return 1
 
-        signal.signal(signal.SIGWINCH, self._handle_resize)
-
         self.running = True
+        self._done = asyncio.Event()
+        self._flush_event = asyncio.Event()
+        self._input_sent = asyncio.Event()
+        self._input_slots = asyncio.Semaphore(MAX_INFLIGHT_INPUT if self.ordered_input else 1)
+
+        loop = asyncio.get_running_loop()
+        loop.add_signal_handler(signal.SIGWINCH, self._handle_resize)
 
         # Choose output method based on streaming support
         output_method = self.stream_output if self.use_streaming else self.poll_output
-        output_thread = threading.Thread(target=output_method, daemon=True)
-        input_thread = threading.Thread(target=self.send_input, daemon=True)
-        flush_thread = threading.Thread(target=self.flush_input, daemon=True)
+        tasks = []
+        stdin_fd = sys.stdin.fileno() if sys.stdin.isatty() else None
 
         try:
             self._setup_raw_mode()
 
-            output_thread.start()
-            input_thread.start()
-            flush_thread.start()
+            # Keystrokes wake the loop directly; no select() timeout polling
+            if stdin_fd is not None:
+                loop.add_reader(stdin_fd, self._read_stdin)
 
-            while self.running:
-                time.sleep(0.1)
-                if not output_thread.is_alive() or not input_thread.is_alive() or not flush_thread.is_alive():
-                    break
+            tasks = [
+                asyncio.create_task(self._worker(output_method())),
+                asyncio.create_task(self._worker(self.flush_input())),
+            ]
 
-        except KeyboardInterrupt:
+            # Wait for any worker to exit
+            await self._done.wait()
+
+        except (KeyboardInterrupt, asyncio.CancelledError):
             print("\r\n^C - Exiting...")
         finally:
             self.running = False
+            if stdin_fd is not None:
+                loop.remove_reader(stdin_fd)
+            loop.remove_signal_handler(signal.SIGWINCH)
             self._restore_tty()
 
-            output_thread.join(timeout=1.0)
-            input_thread.join(timeout=1.0)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+            # Let input already sent (e.g. the final "exit") reach the server
+            if self._input_tasks:
+                await asyncio.wait(self._input_tasks, timeout=2.0)
 
-            self.close_session()
+            await self.close_session()
+            await self._client.aclose()
             print("\nSession closed")
 
         return 0
@@ -467,7 +765,7 @@ def main():
         if args.no_streaming:
             client.use_streaming = False
 
-        return client.run()
+        return asyncio.run(client.run())
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         return 1
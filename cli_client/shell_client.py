@@ -8,7 +8,7 @@ Interactive shell client that connects to either:
 
 Usage:
     # Local API server mode
-    python shell_client.py [--url URL] [--cwd CWD]
+    python shell_client.py [--url URL] [--cwd CWD] [--compress]
 
     # AgentCore mode (requires TOKEN environment variable)
     python shell_client.py --agentcore --agentcore-url https://your-agentcore-url/invocations
@@ -35,6 +35,9 @@ Examples:
 """
 
 import argparse
+import asyncio
+import functools
+import signal
 import sys
 import json
 import os
@@ -44,6 +47,33 @@ from typing import Optional
 
 import httpx
 
+try:
+    import h2  # noqa: F401 - optional, enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import orjson  # optional, faster JSON for request bodies
+    _json_dumps = orjson.dumps
+except ImportError:
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+# AgentCore settings from the environment (read once per process)
+_ENV_TOKEN = os.environ.get('TOKEN')
+_ENV_AGENT_ARN = os.environ.get('AGENT_ARN')
+_ENV_REGION = os.environ.get('AWS_REGION', 'us-west-2')
+
+AGENTCORE_PROMPT = "\033[1;35mAgentCore\033[0m $ "
+
+
+@functools.lru_cache(maxsize=None)
+def _agentcore_url(agent_arn: str, region: str) -> str:
+    """Build the AgentCore invocations URL for an agent ARN."""
+    escaped_agent_arn = urllib.parse.quote(agent_arn, safe='')
+    return f"https://bedrock-agentcore.{region}.amazonaws.com/runtimes/{escaped_agent_arn}/invocations?qualifier=DEFAULT"
+
 
 class ShellClient:
     """Interactive shell client using invocations API or AgentCore."""
@@ -56,14 +86,29 @@ class ShellClient:
         agentcore_url: Optional[str] = None,
         region: Optional[str] = None,
         agent_arn: Optional[str] = None,
-        auth_token: Optional[str] = None
+        auth_token: Optional[str] = None,
+        compress: bool = False
     ):
         self.agentcore_mode = agentcore_mode
         self.running = True
+        self._http: Optional[httpx.AsyncClient] = None
+        self._prompt_cwd: Optional[str] = None
+        self._prompt = ""
+
+        # /shell/execute request template; only command and cwd change per call
+        self._execute_args = {"command": None, "cwd": None}
+        if compress:
+            # Ask the server to gzip command output (decoded by httpx)
+            self._execute_args["compress"] = True
+        self._execute_payload = {
+            "path": "/shell/execute",
+            "method": "POST",
+            "payload": self._execute_args
+        }
 
         if agentcore_mode:
             # AgentCore mode setup
-            self.auth_token = auth_token or os.environ.get('TOKEN')
+            self.auth_token = auth_token or _ENV_TOKEN
             if not self.auth_token:
                 raise ValueError("TOKEN environment variable is required for AgentCore mode")
 
@@ -73,172 +118,206 @@ class ShellClient:
                 self.agent_arn = None
                 self.region = None
             else:
-                self.agent_arn = agent_arn or os.environ.get('AGENT_ARN')
-                self.region = region or os.environ.get('AWS_REGION', 'us-west-2')
+                self.agent_arn = agent_arn or _ENV_AGENT_ARN
+                self.region = region or _ENV_REGION
 
                 if not self.agent_arn:
                     raise ValueError("AGENT_ARN environment variable or --agentcore-url is required for AgentCore mode")
 
                 # Construct AgentCore URL from ARN
-                escaped_agent_arn = urllib.parse.quote(self.agent_arn, safe='')
-                self.base_url = f"https://bedrock-agentcore.{self.region}.amazonaws.com/runtimes/{escaped_agent_arn}/invocations?qualifier=DEFAULT"
+                self.base_url = _agentcore_url(self.agent_arn, self.region)
 
             # Generate session ID with full UUID (36 chars) + prefix = 50 chars total
             self.session_id = f"shell-session-{uuid.uuid4()}"
             self.current_cwd = initial_cwd or "/workspace"
+            self._http = self._create_http_client()
         else:
             # Local API server mode
             self.base_url = base_url or "http://127.0.0.1:8000"
             self.invocations_url = f"{self.base_url}/invocations"
-            self.current_cwd = initial_cwd or self._get_initial_cwd()
+            self._http = self._create_http_client()
+            self.current_cwd = initial_cwd  # Fetched from the server in run() if unset
             self.agent_arn = None
             self.auth_token = None
             self.session_id = None
 
-    def _get_initial_cwd(self) -> str:
+    def _create_http_client(self) -> httpx.AsyncClient:
+        """Create the keep-alive HTTP client shared by all requests."""
+        # Request bodies are pre-serialized JSON (see _json_dumps)
+        headers = {"Content-Type": "application/json"}
+        if self.agentcore_mode:
+            headers.update({
+                "Authorization": f"Bearer {self.auth_token}",
+                "X-Amzn-Bedrock-AgentCore-Runtime-Session-Id": self.session_id
+            })
+        return httpx.AsyncClient(
+            headers=headers,
+            http2=HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(300.0, connect=5.0),
+            limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=60)
+        )
+
+    async def close(self) -> None:
+        """Close the shared HTTP client."""
+        await self._http.aclose()
+
+    async def _get_initial_cwd(self) -> str:
         """Get initial working directory from server (local mode only)."""
         if self.agentcore_mode:
             return "/workspace"
 
         try:
-            with httpx.Client() as client:
-                response = client.post(
-                    self.invocations_url,
-                    json={
-                        "path": "/shell/cwd",
-                        "method": "GET"
-                    },
-                    timeout=10.0
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    return data.get("cwd", "/workspace")
+            response = await self._http.post(
+                self.invocations_url,
+                content=_json_dumps({
+                    "path": "/shell/cwd",
+                    "method": "GET"
+                }),
+                timeout=10.0
+            )
+            if response.status_code == 200:
+                data = response.json()
+                return data.get("cwd", "/workspace")
         except Exception as e:
             print(f"Warning: Could not get initial cwd: {e}")
         return "/workspace"
 
-    def execute_command_agentcore(self, command: str) -> None:
+    def _execute_body(self, command: str) -> bytes:
+        """Serialize the invocations request that runs ``command``."""
+        self._execute_args["command"] = command
+        self._execute_args["cwd"] = self.current_cwd
+        return _json_dumps(self._execute_payload)
+
+    async def execute_command_agentcore(self, command: str) -> None:
         """Execute command via AWS Bedrock AgentCore."""
         try:
-            headers = {
-                "Authorization": f"Bearer {self.auth_token}",
-                "X-Amzn-Trace-Id": f"shell-trace-{uuid.uuid4()}",
-                "Content-Type": "application/json",
-                "X-Amzn-Bedrock-AgentCore-Runtime-Session-Id": self.session_id
-            }
-
-            # Use the same invocations payload format as local mode
-            payload = {
-                "path": "/shell/execute",
-                "method": "POST",
-                "payload": {
-                    "command": command,
-                    "cwd": self.current_cwd
-                }
-            }
-
-            with httpx.Client() as client:
-                # Stream the response
-                with client.stream(
-                    "POST",
-                    self.base_url,
-                    headers=headers,
-                    json=payload,
-                    timeout=300.0
-                ) as response:
-                    if response.status_code != 200:
-                        print(f"Error: {response.status_code}")
-                        try:
-                            error_data = response.json()
-                            print(json.dumps(error_data, indent=2))
-                        except:
-                            print(response.text[:500])
-                        return
-
-                    # Stream output
-                    for chunk in response.iter_bytes():
-                        if chunk:
-                            print(chunk.decode('utf-8', errors='replace'), end='', flush=True)
+            # Auth and session headers are set on the shared client
+            headers = {"X-Amzn-Trace-Id": f"shell-trace-{uuid.uuid4().hex}"}
+
+            # Stream the response
+            async with self._http.stream(
+                "POST",
+                self.base_url,
+                headers=headers,
+                content=self._execute_body(command)
+            ) as response:
+                if response.status_code != 200:
+                    print(f"Error: {response.status_code}")
+                    try:
+                        await response.aread()
+                        error_data = response.json()
+                        print(json.dumps(error_data, indent=2))
+                    except:
+                        print(response.text[:500])
+                    return
+
+                # Stream output
+                await self._write_stream(response)
+                self._apply_cwd_header(response)
 
         except httpx.TimeoutException:
             print("\nError: Command execution timed out")
         except httpx.RequestError as e:
             print(f"\nError: Failed to execute command: {e}")
-        except KeyboardInterrupt:
-            print("\n^C")
         except Exception as e:
             print(f"\nError: {e}")
 
-    def execute_command_local(self, command: str) -> None:
+    async def execute_command_local(self, command: str) -> None:
         """Execute command via local API server."""
         try:
-            with httpx.Client() as client:
-                # Stream the command execution
-                with client.stream(
-                    "POST",
-                    self.invocations_url,
-                    json={
-                        "path": "/shell/execute",
-                        "method": "POST",
-                        "payload": {
-                            "command": command,
-                            "cwd": self.current_cwd
-                        }
-                    },
-                    timeout=300.0
-                ) as response:
-                    if response.status_code != 200:
-                        print(f"Error: {response.status_code} {response.reason_phrase}")
-                        return
-
-                    # Stream output line by line
-                    for chunk in response.iter_bytes():
-                        if chunk:
-                            print(chunk.decode('utf-8', errors='replace'), end='', flush=True)
-
-                # Update current directory if it was a cd command
-                if command.strip().startswith('cd '):
-                    self._update_cwd()
+            # Stream the command execution
+            async with self._http.stream(
+                "POST",
+                self.invocations_url,
+                content=self._execute_body(command)
+            ) as response:
+                if response.status_code != 200:
+                    print(f"Error: {response.status_code} {response.reason_phrase}")
+                    return
+
+                # Stream output
+                await self._write_stream(response)
+                self._apply_cwd_header(response)
 
         except httpx.TimeoutException:
             print("\nError: Command execution timed out")
         except httpx.RequestError as e:
             print(f"\nError: Failed to execute command: {e}")
-        except KeyboardInterrupt:
-            print("\n^C")
         except Exception as e:
             print(f"\nError: {e}")
 
-    def execute_command(self, command: str) -> None:
-        """Execute a shell command."""
-        if self.agentcore_mode:
-            self.execute_command_agentcore(command)
+    async def _write_stream(self, response: httpx.Response) -> None:
+        """Copy streamed command output to the terminal as raw bytes."""
+        # Without a Content-Encoding there is nothing to decode, so skip
+        # httpx's decoder. No chunk_size: httpx would hold output back to
+        # fill it, and interactive commands need to show up as they run.
+        if "content-encoding" in response.headers:
+            chunks = response.aiter_bytes()
         else:
-            self.execute_command_local(command)
+            chunks = response.aiter_raw()
 
-    def _update_cwd(self) -> None:
-        """Update current working directory from server (local mode only)."""
+        sys.stdout.flush()  # Anything already printed goes first
+        try:
+            fd = sys.stdout.fileno()
+        except (AttributeError, OSError):
+            fd = None  # stdout replaced by a non-file object
+
+        async for chunk in chunks:
+            if not chunk:
+                continue
+            if fd is None:
+                sys.stdout.buffer.write(chunk)
+                sys.stdout.buffer.flush()
+                continue
+            # One write syscall per chunk, bypassing Python's IO stack
+            view = memoryview(chunk)
+            while view:
+                view = view[os.write(fd, view):]
+
+    async def execute_command(self, command: str) -> None:
+        """Execute a shell command; Ctrl+C cancels it and returns to the prompt."""
         if self.agentcore_mode:
-            return
+            task = asyncio.create_task(self.execute_command_agentcore(command))
+        else:
+            task = asyncio.create_task(self.execute_command_local(command))
 
+        loop = asyncio.get_running_loop()
+        loop.add_signal_handler(signal.SIGINT, task.cancel)
         try:
-            with httpx.Client() as client:
-                response = client.post(
-                    self.invocations_url,
-                    json={
-                        "path": "/shell/cwd",
-                        "method": "GET"
-                    },
-                    timeout=10.0
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    self.current_cwd = data.get("cwd", self.current_cwd)
-        except Exception as e:
-            print(f"Warning: Could not update cwd: {e}")
+            await task
+        except asyncio.CancelledError:
+            print("\n^C")
+        finally:
+            # Restores the default handler, so input() raises KeyboardInterrupt
+            loop.remove_signal_handler(signal.SIGINT)
+
+    def _apply_cwd_header(self, response: httpx.Response) -> None:
+        """Pick up the new working directory reported after a cd command."""
+        new_cwd = response.headers.get("x-shell-cwd")
+        if new_cwd:
+            self.current_cwd = urllib.parse.unquote(new_cwd)
+
+    def _get_prompt(self) -> str:
+        """Return the prompt, re-formatting it only when the cwd changes."""
+        if self.agentcore_mode:
+            return AGENTCORE_PROMPT
+        if self.current_cwd != self._prompt_cwd:
+            self._prompt_cwd = self.current_cwd
+            self._prompt = f"\033[1;36m{self.current_cwd}\033[0m $ "
+        return self._prompt
 
-    def run(self) -> None:
+    async def run(self) -> None:
         """Run the interactive shell."""
+        # The prompt blocks in input() on the main thread (nothing else needs
+        # the loop meanwhile), so Ctrl+C there must raise KeyboardInterrupt
+        # rather than cancel the whole run as asyncio.run's handler would
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+
+        # Fetch the initial cwd while the banner is printed
+        cwd_task = None
+        if not self.current_cwd:
+            cwd_task = asyncio.create_task(self._get_initial_cwd())
+
         print("Shell CLI Client")
         if self.agentcore_mode:
             print(f"Mode: AWS Bedrock AgentCore")
@@ -249,40 +328,41 @@ class ShellClient:
         else:
             print(f"Mode: Local API Server")
             print(f"Connected to: {self.base_url}")
+            if cwd_task:
+                self.current_cwd = await cwd_task
             print(f"Working directory: {self.current_cwd}")
         print("Type 'exit' or 'quit' to exit, Ctrl+C to interrupt command")
         print()
 
-        while self.running:
-            try:
-                # Show prompt
-                if self.agentcore_mode:
-                    prompt = "\033[1;35mAgentCore\033[0m $ "
-                else:
-                    prompt = f"\033[1;36m{self.current_cwd}\033[0m $ "
-                command = input(prompt).strip()
-
-                # Handle empty command
-                if not command:
-                    continue
-
-                # Handle exit commands
-                if command.lower() in ['exit', 'quit']:
-                    print("Goodbye!")
+        try:
+            while self.running:
+                try:
+                    # Show prompt
+                    command = input(self._get_prompt()).strip()
+
+                    # Handle empty command
+                    if not command:
+                        continue
+
+                    # Handle exit commands
+                    if command.lower() in ['exit', 'quit']:
+                        print("Goodbye!")
+                        break
+
+                    # Execute command
+                    await self.execute_command(command)
+
+                except KeyboardInterrupt:
+                    print("\n^C")
+                    print("Type 'exit' or 'quit' to exit")
+                except EOFError:
+                    print("\nGoodbye!")
                     break
+                except Exception as e:
+                    print(f"Error: {e}")
 
-                # Execute command
-                self.execute_command(command)
-
-            except KeyboardInterrupt:
-                print("\n^C")
-                print("Type 'exit' or 'quit' to exit")
-            except EOFError:
-                print("\nGoodbye!")
-                break
-            except Exception as e:
-                print(f"Error: {e}")
-
+        finally:
+            await self.close()
 
 def main():
     """Main entry point."""
@@ -328,6 +408,11 @@ Examples:
         "--cwd",
         help="Initial working directory (local mode)"
     )
+    parser.add_argument(
+        "--compress",
+        action="store_true",
+        help="Ask the server to gzip command output (useful over slow links)"
+    )
 
     # AgentCore mode options
     parser.add_argument(
@@ -358,16 +443,18 @@ Examples:
                 region=args.region,
                 agent_arn=args.agent_arn,
                 auth_token=args.token,
-                initial_cwd=args.cwd
+                initial_cwd=args.cwd,
+                compress=args.compress
             )
         else:
             # Local mode
             client = ShellClient(
                 base_url=args.url,
-                initial_cwd=args.cwd
+                initial_cwd=args.cwd,
+                compress=args.compress
             )
 
-        client.run()
+        asyncio.run(client.run())
 
     except ValueError as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -1,6 +1,11 @@
 import boto3
+from botocore.config import Config
 
-client = boto3.client('bedrock-agentcore-control', region_name='us-west-2')
+client = boto3.client(
+    'bedrock-agentcore-control',
+    region_name='us-west-2',
+    config=Config(retries={"mode": "standard", "max_attempts": 3}, tcp_keepalive=True),
+)
 
 response = client.create_agent_runtime(
     agentRuntimeName='claude_code_2',
@@ -0,0 +1,65 @@
+"""Tests for SessionManager's session file scan."""
+
+import json
+from pathlib import Path
+
+from backend.core.session_manager import SessionManager
+
+FIXTURE = Path(__file__).parent / "fixtures" / "session.jsonl"
+
+
+def _reference_scan(session_file):
+    """The fully parsing scan that the byte-level classification replaced."""
+    summary = None
+    first_user_message = None
+    message_count = 0
+
+    with open(session_file, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            entry_type = entry.get("type")
+
+            if entry_type in ["user", "assistant"]:
+                message_count += 1
+                if entry_type == "user" and not first_user_message:
+                    content = entry.get("message", {}).get("content", "")
+                    if isinstance(content, str):
+                        first_user_message = content
+                    elif isinstance(content, list) and len(content) > 0:
+                        first_block = content[0]
+                        if isinstance(first_block, dict):
+                            first_user_message = first_block.get("text", "")
+                        elif isinstance(first_block, str):
+                            first_user_message = first_block
+
+            if entry_type == "summary" and not summary:
+                summary = entry.get("summary", "")
+
+    return summary, first_user_message, message_count
+
+
+def test_scan_matches_reference():
+    assert SessionManager._scan_session_file(str(FIXTURE)) == _reference_scan(FIXTURE)
+
+
+def test_scan_counts_only_top_level_messages():
+    summary, first_user_message, message_count = SessionManager._scan_session_file(
+        str(FIXTURE)
+    )
+    assert summary == "Fix the login redirect"
+    assert first_user_message == "Why does login redirect twice?"
+    assert message_count == 4
+
+
+def test_entry_type():
+    assert SessionManager._entry_type(b'{"a":1,"type":"user","message":{}}\n') == "user"
+    assert SessionManager._entry_type(b'{"type":"progress","x":1}\n') == ""
+    # The key sits behind a nested object, or the line is truncated
+    assert SessionManager._entry_type(b'{"data":{"type":"user"},"type":"x"}\n') is None
+    assert SessionManager._entry_type(b'{"type":"user","message":{"con\n') is None
@@ -0,0 +1,59 @@
+"""Tests for AgentSession's status polling hints."""
+
+import types
+
+import pytest
+from fastapi import HTTPException
+
+from backend.core import session as session_module
+from backend.core import session_manager as session_manager_module
+from backend.core.session import STATUS_POLL_EARLY_LIMIT, AgentSession
+from backend.core.session_manager import SessionManager
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Monotonic clock the test advances by hand."""
+    now = [1000.0]
+    fake_time = types.SimpleNamespace(monotonic=lambda: now[0])
+    monkeypatch.setattr(session_module, "time", fake_time)
+    monkeypatch.setattr(session_manager_module, "time", fake_time)
+    return now
+
+
+def test_interleaved_pollers_following_their_hints_are_served(clock):
+    session = AgentSession("s")
+    # Two clients watching the same session, starting out of phase
+    next_poll = {"a": clock[0], "b": clock[0] + 0.1}
+    for _ in range(200):
+        poller = min(next_poll, key=next_poll.get)
+        clock[0] = next_poll[poller]
+        status = session.get_status()
+        next_poll[poller] = clock[0] + status.retry_after_ms / 1000
+
+
+def test_poller_ignoring_the_hint_gets_429(clock):
+    session = AgentSession("s")
+    session.get_status()
+    for _ in range(STATUS_POLL_EARLY_LIMIT):
+        clock[0] += 0.01
+        session.get_status()
+    clock[0] += 0.01
+    with pytest.raises(HTTPException) as exc_info:
+        session.get_status()
+    assert exc_info.value.status_code == 429
+    assert int(exc_info.value.headers["Retry-After"]) >= 1
+
+
+def test_polling_through_the_manager_keeps_backing_off(clock):
+    manager = SessionManager()
+    manager.sessions["s"] = AgentSession("s")
+    delays = []
+    for _ in range(3):
+        status = manager.get_session("s").get_status()
+        delays.append(status.retry_after_ms)
+        clock[0] += status.retry_after_ms / 1000
+    manager._scan_pool.shutdown()
+    # Each lookup refreshes the idle timer but isn't agent progress
+    assert manager.sessions["s"].last_activity_monotonic == clock[0] - delays[-1] / 1000
+    assert delays[0] < delays[1] < delays[2]